@@ -6,14 +6,37 @@ using the DeepAgents library for agent orchestration, with support for specializ
 Ambient agents and configurable LLM providers.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "DeepAgents Runner Contributors"
 
-# Export main components
-from deepagents_runner.core.agents import AgentManager
-from deepagents_runner.core.state import StateManager
-from deepagents_runner.core.context import ContextDetector
-from deepagents_runner.terminal.repl import REPLSession
+if TYPE_CHECKING:
+    from deepagents_runner.core.agents import AgentManager
+    from deepagents_runner.core.state import StateManager
+    from deepagents_runner.core.context import ContextDetector
+    from deepagents_runner.terminal.repl import REPLSession
+
+# Main components are imported on first access (PEP 562) so that importing the
+# package, e.g. for `--version`, does not pull in the LLM SDKs and Rich
+_LAZY_EXPORTS = {
+    "AgentManager": "deepagents_runner.core.agents",
+    "StateManager": "deepagents_runner.core.state",
+    "ContextDetector": "deepagents_runner.core.context",
+    "REPLSession": "deepagents_runner.terminal.repl",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AgentManager",
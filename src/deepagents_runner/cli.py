@@ -4,9 +4,7 @@ import sys
 import argparse
 from pathlib import Path
 
-from deepagents_runner.terminal.repl import REPLSession
-from deepagents_runner.core.config import ConfigLoader
-from deepagents_runner.utils.exceptions import ProviderConfigError
+from deepagents_runner import __version__
 
 
 def parse_args():
@@ -39,6 +37,7 @@ Environment Variables:
   RUNNER_MODEL            Model name to use
   RUNNER_TEMPERATURE      Sampling temperature (0.0-1.0)
   RUNNER_MAX_TOKENS       Maximum tokens to generate
+  RUNNER_PARALLEL_FALLBACK Query all selected agents at once (true/false)
         """
     )
 
@@ -53,6 +52,14 @@ Environment Variables:
         help="Model name to use (default: provider's default model)"
     )
 
+    parser.add_argument(
+        "--parallel-fallback",
+        action="store_true",
+        default=None,
+        help="Query all agents selected for a command at once and keep the first "
+             "success (default: from RUNNER_PARALLEL_FALLBACK or off)"
+    )
+
     parser.add_argument(
         "--feature",
         help="Feature ID and name (e.g., 001-my-feature)"
@@ -67,7 +74,7 @@ Environment Variables:
     parser.add_argument(
         "--version",
         action="version",
-        version="DeepAgents Runner 1.0.0"
+        version=f"DeepAgents Runner {__version__}"
     )
 
     return parser.parse_args()
@@ -83,11 +90,16 @@ def main() -> int:
         # Parse arguments
         args = parse_args()
 
+        # Imported here so --help/--version don't load the LLM SDKs and Rich
+        from deepagents_runner.core.config import ConfigLoader
+        from deepagents_runner.utils.exceptions import ProviderConfigError
+
         # Load configuration
         try:
             config = ConfigLoader.load_from_args(
                 provider=args.provider,
-                model=args.model
+                model=args.model,
+                parallel_fallback=args.parallel_fallback
             )
         except ProviderConfigError as e:
             print(f"Configuration error: {e}", file=sys.stderr)
@@ -101,6 +113,7 @@ def main() -> int:
             config.workspace_root = args.workspace
 
         # Start REPL session
+        from deepagents_runner.terminal.repl import REPLSession
         session = REPLSession(config=config, workspace_root=config.workspace_root)
         session.start()
 
@@ -1,22 +1,130 @@
 """Agent management and selection."""
 
+import os
+import logging
+import asyncio
+import re
+import hashlib
+import heapq
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from enum import Enum
-import frontmatter
-from tenacity import retry, stop_after_attempt, wait_exponential
+import orjson
+import yaml
 
 from deepagents_runner.models import CommandType
+from deepagents_runner.core.cache import ResponseCache
 from deepagents_runner.llm.base import LLMProvider, Message
 from deepagents_runner.utils.exceptions import (
     AgentDefinitionError,
-    AgentExecutionError
+    AgentExecutionError,
+    AuthenticationError,
+    RateLimitError,
+    TransientError,
 )
+from deepagents_runner.utils.files import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Provider failures worth retrying; anything else (bad credentials, invalid
+# requests, configuration problems) fails immediately
+RETRYABLE_ERRORS = (RateLimitError, TransientError)
+
+
+# Frontmatter delimiter line ("---"), as used by Jekyll-style markdown files
+_FRONTMATTER_BOUNDARY = re.compile(r'^-{3,}\s*$', re.MULTILINE)
+
+# libyaml-backed loader when available; same semantics as SafeLoader
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _parse_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
+    """Split a markdown document into YAML frontmatter metadata and body.
+
+    Args:
+        text: Full document text
+
+    Returns:
+        Tuple of (metadata, content); metadata is empty if there is no frontmatter
+    """
+    text = text.strip()
+    if not _FRONTMATTER_BOUNDARY.match(text):
+        return {}, text
+
+    parts = _FRONTMATTER_BOUNDARY.split(text, 2)
+    if len(parts) < 3:
+        return {}, text
+
+    _, frontmatter_text, content = parts
+    metadata = yaml.load(frontmatter_text, Loader=_YAML_LOADER)
+    if not isinstance(metadata, dict):
+        metadata = {}
+
+    return metadata, content.strip()
+
+
+def _provider_error(error: BaseException) -> BaseException:
+    """Get the provider error behind an AgentExecutionError, if any."""
+    return error.__cause__ or error
+
+
+def _candidate_rank(candidate: Tuple["AgentDefinition", int]) -> Tuple[int, int]:
+    """Ranking key for (agent, score) pairs: score first, then agent priority."""
+    agent, score = candidate
+    return (score, agent.priority)
+
+
+def _build_messages(
+    agent: "AgentDefinition",
+    task_prompt: str,
+    instructions: Optional[str] = None
+) -> List[Message]:
+    """Build the conversation for an agent task.
+
+    The agent prompt, followed by any fixed task instructions, is identical
+    on every call for the same agent and command, so it is sent as a system
+    message that providers may cache. Only the task prompt varies.
+    """
+    system_prompt = agent.content if not instructions else f"{agent.content}\n\n{instructions}"
+    return [
+        Message("system", system_prompt, cache_control=True),
+        Message("user", task_prompt)
+    ]
+
+
+def _default_parse_cache_file() -> Path:
+    """Get the location of the parsed agent definition cache."""
+    return user_cache_dir() / "agents.json"
 
 
 class AgentDefinition:
     """Represents a loaded agent definition."""
 
+    __slots__ = (
+        'file_path',
+        'name',
+        'role',
+        'specialization',
+        'capabilities',
+        'capabilities_set',
+        'priority',
+        'content',
+        'content_hash',
+        'enabled',
+    )
+
     def __init__(self, file_path: Path, metadata: Dict[str, Any], content: str):
         """Initialize agent definition.
 
@@ -30,30 +138,36 @@ class AgentDefinition:
         self.role = metadata.get('role', 'generic')
         self.specialization = metadata.get('specialization')
         self.capabilities = metadata.get('capabilities', [])
+        self.capabilities_set: FrozenSet[str] = frozenset(self.capabilities)
         self.priority = metadata.get('priority', 1)
         self.content = content
+        # Stable digest of the prompt, used in cache keys instead of the full text
+        self.content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
         self.enabled = True  # Can be disabled at session level
 
-    def matches_capabilities(self, required_capabilities: List[str]) -> bool:
+    def matches_capabilities(self, required_capabilities: Iterable[str]) -> bool:
         """Check if agent has required capabilities.
 
         Args:
-            required_capabilities: List of capability names
+            required_capabilities: Capability names (pass a frozenset to avoid conversion)
 
         Returns:
             True if agent has all required capabilities
         """
-        return all(cap in self.capabilities for cap in required_capabilities)
+        return self.capabilities_set.issuperset(required_capabilities)
 
-    def score_for_task(self, required_capabilities: List[str]) -> int:
+    def score_for_task(self, required_capabilities: Iterable[str]) -> int:
         """Calculate priority score for a task.
 
         Args:
-            required_capabilities: List of capability names
+            required_capabilities: Capability names (pass a frozenset to avoid conversion)
 
         Returns:
             Priority score (higher is better)
         """
+        if not isinstance(required_capabilities, frozenset):
+            required_capabilities = frozenset(required_capabilities)
+
         if not self.matches_capabilities(required_capabilities):
             return 0
 
@@ -61,7 +175,7 @@ class AgentDefinition:
         score = self.priority
 
         # Bonus for exact capability match
-        if set(required_capabilities) == set(self.capabilities):
+        if required_capabilities == self.capabilities_set:
             score += 5
 
         return score
@@ -70,23 +184,42 @@ class AgentDefinition:
 class AgentManager:
     """Manages agent definitions and selection."""
 
-    # Map command types to required capabilities
-    COMMAND_CAPABILITIES: Dict[CommandType, List[str]] = {
-        CommandType.SPECIFY: [],  # Use generic
-        CommandType.CLARIFY: [],  # Use generic
-        CommandType.PLAN: ['architecture_design', 'component_design'],
-        CommandType.TASKS: ['project_management', 'task_breakdown'],
-        CommandType.IMPLEMENT: ['backend_implementation', 'frontend_implementation'],
-        CommandType.ANALYZE: ['code_quality', 'code_review'],
-        CommandType.CHECKLIST: ['quality_assurance', 'testing'],
-        CommandType.CONSTITUTION: ['project_management'],
+    # Map command types to required capabilities (frozensets, ready for scoring)
+    COMMAND_CAPABILITIES: Dict[CommandType, FrozenSet[str]] = {
+        CommandType.SPECIFY: frozenset(),  # Use generic
+        CommandType.CLARIFY: frozenset(),  # Use generic
+        CommandType.PLAN: frozenset({'architecture_design', 'component_design'}),
+        CommandType.TASKS: frozenset({'project_management', 'task_breakdown'}),
+        CommandType.IMPLEMENT: frozenset({'backend_implementation', 'frontend_implementation'}),
+        CommandType.ANALYZE: frozenset({'code_quality', 'code_review'}),
+        CommandType.CHECKLIST: frozenset({'quality_assurance', 'testing'}),
+        CommandType.CONSTITUTION: frozenset({'project_management'}),
     }
 
-    def __init__(self, agents_dir: Optional[Path] = None):
+    # Upper bound on threads used to read agent files at startup
+    MAX_LOAD_WORKERS = 8
+
+    # Bump when the layout of cached parse results changes
+    PARSE_CACHE_VERSION = 1
+
+    # Retry policy for execute_agent (exponential backoff, in seconds)
+    MAX_ATTEMPTS = 3
+    RETRY_MIN_WAIT = 2
+    RETRY_MAX_WAIT = 10
+
+    def __init__(
+        self,
+        agents_dir: Optional[Path] = None,
+        response_cache: Optional[ResponseCache] = None,
+        parse_cache_file: Optional[Path] = None
+    ):
         """Initialize agent manager.
 
         Args:
             agents_dir: Directory containing agent definitions
+            response_cache: Cache for agent responses (a private one is created if omitted)
+            parse_cache_file: JSON file caching parsed agent files by mtime
+                (defaults to the user cache directory)
         """
         if agents_dir is None:
             # Default to bundled agents
@@ -94,6 +227,17 @@ class AgentManager:
 
         self.agents_dir = agents_dir
         self.agents: List[AgentDefinition] = []
+        self._agents_by_priority: List[AgentDefinition] = []
+        self._generic_agent: Optional[AgentDefinition] = None
+        self._by_lower_name: Dict[str, AgentDefinition] = {}
+        # Bumped whenever the enabled set changes; keys the selection cache
+        self._enabled_version = 0
+        self._selection_cache: Dict[Tuple[CommandType, int], Tuple[AgentDefinition, ...]] = {}
+        self._agent_list_markdown: Optional[str] = None
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.parse_cache_file = parse_cache_file or _default_parse_cache_file()
+        # Maps file path -> (mtime_ns, metadata, content); populated during _load_agents
+        self._parse_cache: Dict[str, Tuple[int, Dict[str, Any], str]] = {}
         self._load_agents()
 
     def _load_agents(self) -> None:
@@ -101,12 +245,95 @@ class AgentManager:
         if not self.agents_dir.exists():
             raise AgentDefinitionError(f"Agents directory not found: {self.agents_dir}")
 
-        for agent_file in self.agents_dir.glob("*.md"):
-            try:
-                self.agents.append(self._load_agent(agent_file))
-            except Exception as e:
-                # Log but don't fail on individual agent load errors
-                print(f"Warning: Failed to load agent {agent_file}: {e}")
+        agent_files = list(self.agents_dir.glob("*.md"))
+        cached_entries = self._read_parse_cache()
+        self._parse_cache = dict(cached_entries)
+
+        if agent_files:
+            # File reads and YAML parsing are independent per agent
+            max_workers = min(self.MAX_LOAD_WORKERS, len(agent_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._try_load_agent, agent_files))
+
+            for agent_file, result in zip(agent_files, results):
+                if isinstance(result, Exception):
+                    # Log but don't fail on individual agent load errors
+                    logger.warning("Failed to load agent %s: %s", agent_file, result)
+                else:
+                    self.agents.append(result)
+
+        if self._parse_cache != cached_entries:
+            self._write_parse_cache()
+
+        self._build_indexes()
+
+    def _read_parse_cache(self) -> Dict[str, Tuple[int, Dict[str, Any], str]]:
+        """Read the parsed agent cache, returning an empty cache if unusable."""
+        try:
+            data = orjson.loads(self.parse_cache_file.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.PARSE_CACHE_VERSION:
+            return {}
+        entries = data.get('entries')
+        if not isinstance(entries, dict):
+            return {}
+
+        # JSON stores the (mtime_ns, metadata, content) tuples as arrays;
+        # malformed entries are dropped and the file re-parsed
+        cache: Dict[str, Tuple[int, Dict[str, Any], str]] = {}
+        for path, entry in entries.items():
+            if (
+                isinstance(entry, list) and len(entry) == 3
+                and isinstance(entry[0], int)
+                and isinstance(entry[1], dict)
+                and isinstance(entry[2], str)
+            ):
+                cache[path] = (entry[0], entry[1], entry[2])
+        return cache
+
+    def _write_parse_cache(self) -> None:
+        """Persist the parsed agent cache atomically; failures are ignored."""
+        data = {'version': self.PARSE_CACHE_VERSION, 'entries': self._parse_cache}
+        # Per-process name, so concurrent runners do not write the same file
+        temp_path = self.parse_cache_file.with_name(
+            f"{self.parse_cache_file.name}.{os.getpid()}.tmp"
+        )
+        try:
+            payload = orjson.dumps(data, default=str)
+            self.parse_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, self.parse_cache_file)
+        except (OSError, TypeError):
+            # The cache only speeds up startup; never fail loading over it
+            pass
+
+    def _build_indexes(self) -> None:
+        """Precompute lookup structures over the loaded agents."""
+        self._agents_by_priority = sorted(self.agents, key=lambda a: -a.priority)
+        self._generic_agent = next(
+            (agent for agent in self.agents if agent.role == 'generic'),
+            None
+        )
+        # Later entries win, so build from lowest priority up: with duplicate
+        # names the highest-priority (then first-loaded) agent is kept
+        self._by_lower_name = {
+            agent.name.lower(): agent for agent in reversed(self._agents_by_priority)
+        }
+
+    def _bump_enabled_version(self) -> None:
+        """Invalidate cached selections after the enabled set changed."""
+        self._enabled_version += 1
+        self._selection_cache.clear()
+        self._agent_list_markdown = None
+
+    def _try_load_agent(self, file_path: Path) -> Union[AgentDefinition, Exception]:
+        """Load a single agent definition, returning the error instead of raising."""
+        try:
+            return self._load_agent(file_path)
+        except Exception as e:
+            return e
 
     def _load_agent(self, file_path: Path) -> AgentDefinition:
         """Load a single agent definition.
@@ -121,18 +348,25 @@ class AgentManager:
             AgentDefinitionError: If agent file is invalid
         """
         try:
-            with open(file_path, 'r') as f:
-                post = frontmatter.load(f)
+            cache_key = str(file_path)
+            mtime_ns = os.stat(file_path).st_mtime_ns
+
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                _, metadata, content = cached
+            else:
+                metadata, content = _parse_frontmatter(file_path.read_text(encoding='utf-8'))
+                self._parse_cache[cache_key] = (mtime_ns, metadata, content)
 
             return AgentDefinition(
                 file_path=file_path,
-                metadata=post.metadata,
-                content=post.content
+                metadata=metadata,
+                content=content
             )
         except Exception as e:
             raise AgentDefinitionError(f"Failed to parse {file_path}: {e}")
 
-    def select_agent(self, required_capabilities: List[str]) -> Optional[AgentDefinition]:
+    def select_agent(self, required_capabilities: Iterable[str]) -> Optional[AgentDefinition]:
         """Select best agent for required capabilities.
 
         Args:
@@ -141,21 +375,20 @@ class AgentManager:
         Returns:
             Best matching agent, or None if no match
         """
-        candidates = [
-            (agent, agent.score_for_task(required_capabilities))
-            for agent in self.agents
-        ]
+        if not isinstance(required_capabilities, frozenset):
+            required_capabilities = frozenset(required_capabilities)
 
-        # Filter to only agents that can handle the task
-        candidates = [(agent, score) for agent, score in candidates if score > 0]
+        # Score agents, keeping only those that can handle the task
+        candidates = (
+            (agent, score)
+            for agent in self._agents_by_priority
+            if (score := agent.score_for_task(required_capabilities)) > 0
+        )
 
-        if not candidates:
-            return None
+        # Best by score, then by priority
+        best = heapq.nlargest(1, candidates, key=_candidate_rank)
 
-        # Sort by score (descending) then by priority
-        candidates.sort(key=lambda x: (x[1], x[0].priority), reverse=True)
-
-        return candidates[0][0]
+        return best[0][0] if best else None
 
     def get_generic_agent(self) -> Optional[AgentDefinition]:
         """Get the generic fallback agent.
@@ -163,27 +396,45 @@ class AgentManager:
         Returns:
             Generic agent definition, or None if not found
         """
-        for agent in self.agents:
-            if agent.role == 'generic':
-                return agent
-        return None
+        return self._generic_agent
 
-    def list_agents(self, include_disabled: bool = False) -> List[AgentDefinition]:
+    def list_agents(
+        self,
+        include_disabled: bool = False,
+        by_priority: bool = False
+    ) -> List[AgentDefinition]:
         """Get all loaded agents.
 
         Args:
             include_disabled: Include disabled agents in the list
+            by_priority: Order by priority, highest first (agents with equal
+                priority keep their load order), from the index built at load
 
         Returns:
             List of all agent definitions
         """
+        agents = self._agents_by_priority if by_priority else self.agents
         if include_disabled:
-            return self.agents.copy()
-        return [agent for agent in self.agents if agent.enabled]
+            return agents.copy()
+        return [agent for agent in agents if agent.enabled]
+
+    @property
+    def agent_list_markdown(self) -> str:
+        """Bulleted list of the first ten enabled agents, for use in prompts.
+
+        Rendered once and reused until an agent is enabled or disabled, so
+        prompts embedding it stay byte-identical between calls.
+        """
+        if self._agent_list_markdown is None:
+            self._agent_list_markdown = "\n".join(
+                f"  - {agent.name}: {agent.specialization}"
+                for agent in self.list_agents()[:10]
+            )
+        return self._agent_list_markdown
 
     def select_agents(
         self,
-        required_capabilities: List[str],
+        required_capabilities: Iterable[str],
         max_agents: int = 3
     ) -> List[AgentDefinition]:
         """Select multiple agents for required capabilities.
@@ -195,25 +446,21 @@ class AgentManager:
         Returns:
             List of best matching agents (up to max_agents)
         """
-        # Score all enabled agents
-        candidates = [
-            (agent, agent.score_for_task(required_capabilities))
-            for agent in self.agents
-            if agent.enabled
+        if not isinstance(required_capabilities, frozenset):
+            required_capabilities = frozenset(required_capabilities)
+
+        # Score enabled agents, keeping only those that can handle the task
+        candidates = (
+            (agent, score)
+            for agent in self._agents_by_priority
+            if agent.enabled and (score := agent.score_for_task(required_capabilities)) > 0
+        )
+
+        # Return top N agents by score, then by priority
+        return [
+            agent for agent, score in heapq.nlargest(max_agents, candidates, key=_candidate_rank)
         ]
 
-        # Filter to only agents that can handle the task
-        candidates = [(agent, score) for agent, score in candidates if score > 0]
-
-        if not candidates:
-            return []
-
-        # Sort by score (descending)
-        candidates.sort(key=lambda x: (x[1], x[0].priority), reverse=True)
-
-        # Return top N agents
-        return [agent for agent, score in candidates[:max_agents]]
-
     def select_agents_for_command(
         self,
         command_type: CommandType
@@ -226,7 +473,19 @@ class AgentManager:
         Returns:
             List of selected agents (may be empty if using generic)
         """
-        required_caps = self.COMMAND_CAPABILITIES.get(command_type, [])
+        cache_key = (command_type, self._enabled_version)
+        cached = self._selection_cache.get(cache_key)
+        if cached is None:
+            cached = tuple(self._select_agents_for_command(command_type))
+            self._selection_cache[cache_key] = cached
+        return list(cached)
+
+    def _select_agents_for_command(
+        self,
+        command_type: CommandType
+    ) -> List[AgentDefinition]:
+        """Select agents for a command type, bypassing the selection cache."""
+        required_caps = self.COMMAND_CAPABILITIES.get(command_type, frozenset())
 
         if not required_caps:
             # Use generic agent
@@ -253,11 +512,14 @@ class AgentManager:
         Returns:
             True if agent was found and enabled
         """
-        for agent in self.agents:
-            if agent.name.lower() == agent_name.lower():
-                agent.enabled = True
-                return True
-        return False
+        agent = self._by_lower_name.get(agent_name.lower())
+        if agent is None:
+            return False
+
+        if not agent.enabled:
+            agent.enabled = True
+            self._bump_enabled_version()
+        return True
 
     def disable_agent(self, agent_name: str) -> bool:
         """Disable an agent for this session.
@@ -268,11 +530,14 @@ class AgentManager:
         Returns:
             True if agent was found and disabled
         """
-        for agent in self.agents:
-            if agent.name.lower() == agent_name.lower():
-                agent.enabled = False
-                return True
-        return False
+        agent = self._by_lower_name.get(agent_name.lower())
+        if agent is None:
+            return False
+
+        if agent.enabled:
+            agent.enabled = False
+            self._bump_enabled_version()
+        return True
 
     def get_agent_by_name(self, agent_name: str) -> Optional[AgentDefinition]:
         """Get an agent by name.
@@ -283,31 +548,50 @@ class AgentManager:
         Returns:
             AgentDefinition if found, None otherwise
         """
-        for agent in self.agents:
-            if agent.name.lower() == agent_name.lower():
-                return agent
-        return None
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
+        return self._by_lower_name.get(agent_name.lower())
+
+    def _cache_key(
+        self,
+        agent: AgentDefinition,
+        llm_provider: LLMProvider,
+        task_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        instructions: Optional[str]
+    ) -> str:
+        """Build the response cache key for an agent task."""
+        return self.response_cache.make_key(
+            type(llm_provider).__name__,
+            llm_provider.model,
+            temperature,
+            max_tokens,
+            agent.content_hash,
+            instructions,
+            task_prompt
+        )
+
     async def execute_agent(
         self,
         agent: AgentDefinition,
         llm_provider: LLMProvider,
         task_prompt: str,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        instructions: Optional[str] = None
     ) -> str:
         """Execute an agent task with retry logic.
 
+        Low-temperature responses are served from the response cache when the
+        same provider, model, agent and prompt have been answered before.
+
         Args:
             agent: Agent to execute
             llm_provider: LLM provider to use
             task_prompt: User/task prompt for the agent
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            instructions: Fixed task instructions sent after the agent prompt
+                as part of the cacheable system prefix
 
         Returns:
             Generated response from agent
@@ -315,22 +599,306 @@ class AgentManager:
         Raises:
             AgentExecutionError: If execution fails after retries
         """
-        try:
-            messages = [
-                Message("system", agent.content),
-                Message("user", task_prompt)
-            ]
+        cache = self.response_cache
+        cache_key = None
+        if cache.is_cacheable(temperature):
+            cache_key = self._cache_key(
+                agent, llm_provider, task_prompt, temperature, max_tokens, instructions
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = _build_messages(agent, task_prompt, instructions)
+
+        last_error: Optional[Exception] = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = await llm_provider.generate(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                last_error = e
+                if attempt + 1 < self.MAX_ATTEMPTS:
+                    await asyncio.sleep(
+                        min(self.RETRY_MAX_WAIT, self.RETRY_MIN_WAIT * 2 ** attempt)
+                    )
+            except Exception as e:
+                raise AgentExecutionError(f"Agent {agent.name} execution failed: {e}") from e
+        else:
+            raise AgentExecutionError(
+                f"Agent {agent.name} execution failed: {last_error}"
+            ) from last_error
+
+        if cache_key is not None:
+            cache.set(cache_key, response)
+
+        return response
+
+    async def stream_agent(
+        self,
+        agent: AgentDefinition,
+        llm_provider: LLMProvider,
+        task_prompt: str,
+        on_chunk: Callable[[str], None],
+        on_restart: Callable[[], None],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        instructions: Optional[str] = None
+    ) -> str:
+        """Execute an agent task, delivering the response as it is generated.
+
+        Uses the same response cache and retry policy as execute_agent. A
+        cached response is delivered as a single chunk. If an attempt fails
+        after some chunks were delivered, on_restart is called before the
+        failure is retried or raised, so the consumer never holds a partial
+        response from a failed attempt.
+
+        Args:
+            agent: Agent to execute
+            llm_provider: LLM provider to use
+            task_prompt: User/task prompt for the agent
+            on_chunk: Called with each piece of the response as it arrives
+            on_restart: Called when a partially delivered response is discarded
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            instructions: Fixed task instructions, as for execute_agent
+
+        Returns:
+            Complete generated response
+
+        Raises:
+            AgentExecutionError: If execution fails after retries
+        """
+        cache = self.response_cache
+        cache_key = None
+        if cache.is_cacheable(temperature):
+            cache_key = self._cache_key(
+                agent, llm_provider, task_prompt, temperature, max_tokens, instructions
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                on_chunk(cached)
+                return cached
+
+        messages = _build_messages(agent, task_prompt, instructions)
+
+        last_error: Optional[Exception] = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            chunks: List[str] = []
+            try:
+                async for chunk in llm_provider.generate_stream(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ):
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+                break
+            except RETRYABLE_ERRORS as e:
+                if chunks:
+                    on_restart()
+                last_error = e
+                if attempt + 1 < self.MAX_ATTEMPTS:
+                    await asyncio.sleep(
+                        min(self.RETRY_MAX_WAIT, self.RETRY_MIN_WAIT * 2 ** attempt)
+                    )
+            except Exception as e:
+                if chunks:
+                    on_restart()
+                raise AgentExecutionError(f"Agent {agent.name} execution failed: {e}") from e
+        else:
+            raise AgentExecutionError(
+                f"Agent {agent.name} execution failed: {last_error}"
+            ) from last_error
+
+        response = "".join(chunks)
+        if cache_key is not None:
+            cache.set(cache_key, response)
+
+        return response
+
+    async def execute_batch(
+        self,
+        agents: List[AgentDefinition],
+        llm_provider: LLMProvider,
+        task_prompts: List[str],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> List[str]:
+        """Execute several agent tasks concurrently, sharing prompt prefixes.
 
-            response = await llm_provider.generate(
-                messages=messages,
+        Requests are grouped by agent prompt. In each group the first request
+        runs alone so it populates the provider's prompt cache, then the rest
+        of the group is sent concurrently and reuses the cached prefix.
+        Groups run concurrently with each other.
+
+        Args:
+            agents: Agent for each task
+            llm_provider: LLM provider to use
+            task_prompts: Task prompt for each agent (same length as agents)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Responses in the same order as the inputs
+
+        Raises:
+            ValueError: If agents and task_prompts differ in length
+            AgentExecutionError: If any task fails
+        """
+        if len(agents) != len(task_prompts):
+            raise ValueError("agents and task_prompts must have the same length")
+
+        groups: Dict[str, List[int]] = {}
+        for index, agent in enumerate(agents):
+            groups.setdefault(agent.content_hash, []).append(index)
+
+        responses: List[Optional[str]] = [None] * len(agents)
+
+        async def run(index: int) -> None:
+            responses[index] = await self.execute_agent(
+                agent=agents[index],
+                llm_provider=llm_provider,
+                task_prompt=task_prompts[index],
                 temperature=temperature,
                 max_tokens=max_tokens
             )
 
-            return response
+        async def run_group(indexes: List[int]) -> None:
+            first, rest = indexes[0], indexes[1:]
+            await run(first)
+            if rest:
+                await asyncio.gather(*(run(index) for index in rest))
 
-        except Exception as e:
-            raise AgentExecutionError(f"Agent {agent.name} execution failed: {e}")
+        await asyncio.gather(*(run_group(indexes) for indexes in groups.values()))
+        return responses
+
+    async def execute_bulk(
+        self,
+        agent: AgentDefinition,
+        llm_provider: LLMProvider,
+        task_prompts: List[str],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        instructions: Optional[str] = None
+    ) -> List[str]:
+        """Execute many tasks with one agent through the provider's batch interface.
+
+        Meant for non-interactive bulk runs: with a provider batch API the
+        call may take minutes, but tokens cost less. Cached responses are
+        reused and only the rest are submitted. There is no retry or
+        fallback: if any request fails the call fails, but the responses that
+        succeeded are cached first, so a rerun only resubmits the failures.
+
+        Args:
+            agent: Agent to execute
+            llm_provider: LLM provider to use
+            task_prompts: Task prompt for each request
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            instructions: Fixed task instructions, as for execute_agent
+
+        Returns:
+            Responses in the same order as task_prompts
+
+        Raises:
+            AgentExecutionError: If the batch or any request in it fails
+        """
+        cache = self.response_cache
+        responses: List[Optional[str]] = [None] * len(task_prompts)
+        cache_keys: List[Optional[str]] = [None] * len(task_prompts)
+        if cache.is_cacheable(temperature):
+            for index, task_prompt in enumerate(task_prompts):
+                cache_keys[index] = self._cache_key(
+                    agent, llm_provider, task_prompt, temperature, max_tokens, instructions
+                )
+                responses[index] = cache.get(cache_keys[index])
+
+        missing = [index for index, response in enumerate(responses) if response is None]
+        if missing:
+            try:
+                generated = await llm_provider.generate_batch(
+                    [
+                        _build_messages(agent, task_prompts[index], instructions)
+                        for index in missing
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    return_exceptions=True
+                )
+            except Exception as e:
+                raise AgentExecutionError(f"Agent {agent.name} batch execution failed: {e}") from e
+
+            errors: List[BaseException] = []
+            for index, response in zip(missing, generated):
+                if isinstance(response, BaseException):
+                    errors.append(response)
+                    continue
+                responses[index] = response
+                if cache_keys[index] is not None:
+                    cache.set(cache_keys[index], response)
+
+            if errors:
+                raise AgentExecutionError(
+                    f"Agent {agent.name} batch execution failed for {len(errors)} "
+                    f"of {len(missing)} requests: {errors[0]}"
+                ) from errors[0]
+
+        return responses
+
+    async def _race_agents(
+        self,
+        agents: List[AgentDefinition],
+        llm_provider: LLMProvider,
+        task_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        instructions: Optional[str] = None
+    ) -> Tuple[AgentDefinition, str]:
+        """Run agents concurrently and return the first successful response.
+
+        Remaining requests are cancelled once one agent succeeds. When several
+        finish together, the earliest agent in the list wins.
+
+        Returns:
+            Tuple of (agent_used, response)
+
+        Raises:
+            AgentExecutionError: The last failure, if every agent fails
+        """
+        tasks = {
+            asyncio.create_task(self.execute_agent(
+                agent=agent,
+                llm_provider=llm_provider,
+                task_prompt=task_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                instructions=instructions
+            )): agent
+            for agent in agents
+        }
+
+        pending = set(tasks)
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    error = task.exception()
+                    if error is None:
+                        return (tasks[task], task.result())
+                    last_error = error
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
 
     async def execute_with_fallback(
         self,
@@ -338,7 +906,9 @@ class AgentManager:
         llm_provider: LLMProvider,
         task_prompt: str,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        race: bool = False,
+        instructions: Optional[str] = None
     ) -> Tuple[AgentDefinition, str]:
         """Execute with automatic fallback to generic agent on failure.
 
@@ -348,6 +918,9 @@ class AgentManager:
             task_prompt: User/task prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            race: Run all agents concurrently and keep the first success
+                (faster on failure, but pays for every request sent)
+            instructions: Fixed task instructions, as for execute_agent
 
         Returns:
             Tuple of (agent_used, response)
@@ -355,65 +928,151 @@ class AgentManager:
         Raises:
             AgentExecutionError: If all agents fail including generic
         """
-        last_error = None
-        error_details = None
+        async def run(agent: AgentDefinition) -> str:
+            return await self.execute_agent(
+                agent=agent,
+                llm_provider=llm_provider,
+                task_prompt=task_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                instructions=instructions
+            )
 
-        for agent in agents:
+        if race and len(agents) > 1:
             try:
-                response = await self.execute_agent(
-                    agent=agent,
+                return await self._race_agents(
+                    agents=agents,
                     llm_provider=llm_provider,
                     task_prompt=task_prompt,
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    instructions=instructions
                 )
-                return (agent, response)
             except Exception as e:
-                last_error = e
-                # Extract the actual error from RetryError if present
-                if hasattr(e, '__cause__') and e.__cause__:
-                    error_details = str(e.__cause__)
-                else:
-                    error_details = str(e)
-                continue
+                return await self._fallback_to_generic(agents, run, _provider_error(e))
+
+        return await self._run_in_order(agents, run)
 
-        # Try generic agent as last resort
+    async def execute_with_fallback_stream(
+        self,
+        agents: List[AgentDefinition],
+        llm_provider: LLMProvider,
+        task_prompt: str,
+        on_chunk: Callable[[str], None],
+        on_restart: Callable[[], None],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        instructions: Optional[str] = None
+    ) -> Tuple[AgentDefinition, str]:
+        """Stream a response with the same fallback rules as execute_with_fallback.
+
+        Args:
+            agents: List of agents to try (in order)
+            llm_provider: LLM provider to use
+            task_prompt: User/task prompt
+            on_chunk: Called with each piece of the response as it arrives
+            on_restart: Called when a partially delivered response is discarded
+                (before a retry or a fallback agent starts over)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            instructions: Fixed task instructions, as for execute_agent
+
+        Returns:
+            Tuple of (agent_used, complete response)
+
+        Raises:
+            AgentExecutionError: If all agents fail including generic
+        """
+        async def run(agent: AgentDefinition) -> str:
+            return await self.stream_agent(
+                agent=agent,
+                llm_provider=llm_provider,
+                task_prompt=task_prompt,
+                on_chunk=on_chunk,
+                on_restart=on_restart,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                instructions=instructions
+            )
+
+        return await self._run_in_order(agents, run)
+
+    async def _run_in_order(
+        self,
+        agents: List[AgentDefinition],
+        run: Callable[[AgentDefinition], Awaitable[str]]
+    ) -> Tuple[AgentDefinition, str]:
+        """Try agents one at a time until one succeeds, then fall back to generic.
+
+        Args:
+            agents: List of agents to try (in order)
+            run: Executes the task with a given agent
+
+        Returns:
+            Tuple of (agent_used, response)
+
+        Raises:
+            AgentExecutionError: If all agents fail including generic
+        """
+        last_error: Optional[BaseException] = None
+        for agent in agents:
+            try:
+                return (agent, await run(agent))
+            except Exception as e:
+                last_error = _provider_error(e)
+                if isinstance(last_error, AuthenticationError):
+                    # Every agent uses the same credentials
+                    break
+
+        return await self._fallback_to_generic(agents, run, last_error)
+
+    async def _fallback_to_generic(
+        self,
+        agents: List[AgentDefinition],
+        run: Callable[[AgentDefinition], Awaitable[str]],
+        last_error: Optional[BaseException]
+    ) -> Tuple[AgentDefinition, str]:
+        """Try the generic agent as a last resort, or report why all agents failed.
+
+        Args:
+            agents: Agents that were already tried
+            run: Executes the task with a given agent
+            last_error: Failure from the last agent tried
+
+        Returns:
+            Tuple of (generic agent, response)
+
+        Raises:
+            AgentExecutionError: If the generic agent is unavailable or fails
+        """
         generic = self.get_generic_agent()
-        if generic and generic not in agents:
+        if (
+            generic
+            and generic not in agents
+            and not isinstance(last_error, AuthenticationError)
+        ):
             try:
-                response = await self.execute_agent(
-                    agent=generic,
-                    llm_provider=llm_provider,
-                    task_prompt=task_prompt,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return (generic, response)
+                return (generic, await run(generic))
             except Exception as e:
-                last_error = e
-                if hasattr(e, '__cause__') and e.__cause__:
-                    error_details = str(e.__cause__)
-                else:
-                    error_details = str(e)
+                last_error = _provider_error(e)
 
         # Provide helpful error message
-        error_msg = error_details or str(last_error)
+        error_msg = str(last_error)
 
-        # Check for common issues
-        if "authentication" in error_msg.lower() or "api key" in error_msg.lower() or "401" in error_msg:
+        if isinstance(last_error, AuthenticationError):
             raise AgentExecutionError(
                 "Authentication failed. Please check your API key is set correctly:\n"
                 "  export ANTHROPIC_API_KEY=your-key-here\n"
                 "  export OPENAI_API_KEY=your-key-here\n"
                 f"Original error: {error_msg}"
-            )
-        elif "rate limit" in error_msg.lower() or "429" in error_msg:
+            ) from last_error
+        elif isinstance(last_error, RateLimitError):
             raise AgentExecutionError(
                 f"Rate limit exceeded. Please wait a moment and try again.\n"
                 f"Original error: {error_msg}"
-            )
+            ) from last_error
         else:
             raise AgentExecutionError(
                 f"All agents failed to execute.\n"
                 f"Error: {error_msg}"
-            )
+            ) from last_error
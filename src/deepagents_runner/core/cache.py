@@ -0,0 +1,192 @@
+"""Response caching for LLM calls."""
+
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+
+# Names of files written by the cache: "<key>.txt" entries and the
+# "<key>.<pid>.tmp" files they are written through
+_ENTRY_FILE = re.compile(r"[0-9a-f]{128}(?:\.txt|\.\d+\.tmp)")
+
+
+class ResponseCache:
+    """Exact-match cache for LLM responses.
+
+    Responses are kept in an in-memory LRU. When a directory is given they
+    are also written there, one file per key, so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_temperature: float = 0.3,
+        directory: Optional[Path] = None,
+        max_age: Optional[float] = None,
+        enabled: bool = True
+    ):
+        """Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of responses to keep in memory (oldest evicted first)
+            max_temperature: Highest sampling temperature whose responses are cached
+            directory: Optional directory for persisting responses on disk
+            max_age: Seconds a response stays valid (None: no expiry)
+            enabled: If False, nothing is cached
+        """
+        self.max_entries = max_entries
+        self.max_temperature = max_temperature
+        self.directory = directory
+        self.max_age = max_age
+        self.enabled = enabled
+        # Key -> (time stored, response)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the inputs that determine a response.
+
+        The parts are serialized as a JSON array, so a separator inside free
+        text cannot shift the boundary between parts and None stays distinct
+        from the string "None".
+
+        Args:
+            *parts: Provider, model, sampling settings and prompt text
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = orjson.dumps(parts, default=repr)
+        return hashlib.blake2b(payload).hexdigest()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """Check if responses at this temperature are deterministic enough to cache.
+
+        Args:
+            temperature: Sampling temperature of the request
+
+        Returns:
+            True if the response may be cached
+        """
+        return self.enabled and temperature <= self.max_temperature
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response, or None on miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        entry = self._read_entry(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._remember(key, entry[1], stored_at=entry[0])
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            response: Generated response text
+        """
+        self._remember(key, response)
+        self._write_entry(key, response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache usage statistics for this session.
+
+        Returns:
+            Dictionary with hits, misses, in-memory entries and the disk directory
+        """
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "directory": str(self.directory) if self.directory else None,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses, including those persisted on disk.
+
+        Only files the cache wrote are deleted (including temporary files
+        left by interrupted writes); anything else in the directory is kept.
+        """
+        self._entries.clear()
+        if self.directory is None:
+            return
+        try:
+            with os.scandir(self.directory) as entries:
+                names = [entry.name for entry in entries if _ENTRY_FILE.fullmatch(entry.name)]
+        except OSError:
+            return
+        for name in names:
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass
+
+    def _expired(self, stored_at: float) -> bool:
+        """Check if a response stored at this time is too old to use."""
+        return self.max_age is not None and time.time() - stored_at > self.max_age
+
+    def _remember(self, key: str, response: str, stored_at: Optional[float] = None) -> None:
+        """Store a response in the in-memory LRU."""
+        self._entries[key] = (time.time() if stored_at is None else stored_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[Tuple[float, str]]:
+        """Read a persisted response and its write time.
+
+        Returns None if the response is absent, expired or unreadable.
+        """
+        if self.directory is None:
+            return None
+        entry_path = self.directory / f"{key}.txt"
+        try:
+            stored_at = entry_path.stat().st_mtime
+            if self._expired(stored_at):
+                return None
+            return stored_at, entry_path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def _write_entry(self, key: str, response: str) -> None:
+        """Persist a response atomically (best effort)."""
+        if self.directory is None:
+            return
+        entry_path = self.directory / f"{key}.txt"
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(response, encoding='utf-8')
+            os.replace(temp_path, entry_path)
+        except OSError:
+            # The cache is an optimization; a read-only or full disk is not an error
+            pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
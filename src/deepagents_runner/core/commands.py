@@ -1,51 +1,316 @@
 """Command execution engine for SpecKit commands."""
 
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, Set, Tuple, Union
 from datetime import datetime
 
 from deepagents_runner.models import CommandType, WorkflowPhase
 from deepagents_runner.models.feature import Feature
 from deepagents_runner.models.workflow import WorkflowState
 from deepagents_runner.core.state import StateManager
-from deepagents_runner.core.agents import AgentManager
+from deepagents_runner.core.agents import AgentManager, AgentDefinition
+from deepagents_runner.core.cache import ResponseCache
 from deepagents_runner.core.config import RunnerConfig
+from deepagents_runner.core.routing import ModelRouter
 from deepagents_runner.llm.base import LLMProvider, Message
 from deepagents_runner.llm.factory import LLMProviderFactory
 from deepagents_runner.utils.exceptions import CommandExecutionError
 from deepagents_runner.utils.files import write_json
 
 
-async def generate_suggestions(
-    llm_provider: LLMProvider,
-    command_type: CommandType,
-    generated_content: str,
-    agent_manager,
-    temperature: float = 0.7
-) -> str:
-    """Generate suggestions for next steps based on completed work.
+# Prompt templates for each command, filled in with str.format(). Fixed
+# instructions (*_SYSTEM_PROMPT) are sent after the agent prompt in the
+# cacheable system prefix; the task prompt carries only the variable parts.
 
-    Args:
-        llm_provider: LLM provider to use
-        command_type: Type of command that was executed
-        generated_content: The content that was generated
-        agent_manager: Agent manager for listing available agents
-        temperature: Sampling temperature
+_SPECIFY_SYSTEM_PROMPT = (
+    "When asked for a feature specification, generate a comprehensive specification document in "
+    "markdown format following this structure:\n"
+    """
+# Feature Specification: [Feature Name]
 
-    Returns:
-        Markdown-formatted suggestions
+## Overview
+Brief description of the feature.
+
+## User Stories
+List prioritized user stories (P1, P2, P3, P4).
+
+## Functional Requirements
+Detailed functional requirements (FR-001, FR-002, etc.).
+
+## Non-Functional Requirements
+Performance, security, scalability requirements.
+
+## Constraints & Dependencies
+Technical constraints and external dependencies.
+
+## Edge Cases & Error Handling
+Expected edge cases and how to handle them.
+
+Always generate the complete specification document."""
+)
+
+_SPECIFY_PROMPT = """Create a detailed feature specification for:
+
+{user_input}"""
+
+_PLAN_SYSTEM_PROMPT = (
+    "When asked for an implementation plan, generate a comprehensive plan in markdown format "
+    "following this structure:\n"
     """
-    # Get list of available agents
-    available_agents = agent_manager.list_agents()
-    agent_list = "\n".join([f"  - {agent.name}: {agent.specialization}" for agent in available_agents[:10]])  # Show top 10
+# Implementation Plan
 
-    suggestions_prompt = f"""I just completed a {command_type.value} command and generated the following content:
+## Technical Context
+Technologies, frameworks, and tools to be used.
 
----
-{generated_content}
----
+## Architecture & Design
+High-level architecture and component design.
+
+## Data Model
+Key entities and their relationships.
+
+## API Contracts
+Interface definitions and contracts.
+
+## Testing Strategy
+Approach to testing and validation.
+
+## Deployment Plan
+How the feature will be deployed.
+
+Always generate the complete implementation plan."""
+)
+
+_PLAN_PROMPT = (
+    "Based on the following feature specification, create a detailed implementation plan.\n"
+    """
+## Specification:
+{spec_content}"""
+)
+
+_TASKS_SYSTEM_PROMPT = (
+    "When asked for a task breakdown, generate a comprehensive task list in markdown format "
+    "following this structure:\n"
+    """
+# Implementation Tasks
+
+## Phase 1: Setup
+- [ ] T001 [P1] Task description with file path
+
+## Phase 2: Core Implementation
+- [ ] T002 [P1] Task description with file path
+
+... organize tasks by phase and priority ...
+
+Each task should:
+- Have a unique ID (T001, T002, etc.)
+- Include priority (P1, P2, P3, P4)
+- Have a clear, actionable description
+- Specify the file or component to be modified
+
+Always generate the complete task breakdown."""
+)
+
+_TASKS_PROMPT = (
+    "Based on the following specification and implementation plan, create a detailed task "
+    "breakdown.\n"
+    """
+## Specification:
+{spec_content}
+
+## Implementation Plan:
+{plan_content}"""
+)
+
+_IMPLEMENT_SYSTEM_PROMPT = (
+    "When asked for implementation guidance, provide the following for each task (or the specified "
+    "tasks):\n"
+    """
+## Implementation Guidance
+
+For each task, include:
+
+### [Task ID]: [Task Description]
+
+**Implementation Approach:**
+- Step-by-step approach to implement this task
+- Key considerations and gotchas
+- Suggested file structure or changes
+
+**Code Snippets/Pseudocode:**
+- Relevant code examples or pseudocode
+- API signatures or interfaces to implement
+
+**Testing Guidance:**
+- How to test this implementation
+- Key test cases to cover
+
+**Dependencies:**
+- What needs to be done first
+- What other tasks this affects
+
+Provide concrete, actionable guidance that a developer can use to implement each task."""
+)
+
+_IMPLEMENT_PROMPT = (
+    "Generate detailed implementation guidance based on the following tasks and context.\n"
+    """
+{context}
+
+## Tasks:
+{tasks_content}
+
+{task_filter}"""
+)
 
-Based on this {command_type.value}, provide 2-4 specific, actionable suggestions for what to do next.
+_CLARIFY_SYSTEM_PROMPT = (
+    "When asked to clarify a specification, identify ambiguities or underspecified areas and "
+    "generate up to 5 clarification questions that would help resolve them. Format as:\n"
+    """
+## Clarification Questions
+
+1. **Question**: [Clear question]
+   - Context: [Why this matters]
+   - Options: [Possible answers]"""
+)
+
+_CLARIFY_PROMPT = (
+    "Analyze the following specification and identify any ambiguities or underspecified areas.\n"
+    """
+## Specification:
+{spec_content}"""
+)
+
+_ANALYZE_SYSTEM_PROMPT = (
+    "When asked to analyze feature artifacts, provide a comprehensive analysis covering:\n"
+    """
+## Consistency Analysis
+- Are the plan and tasks aligned with the specification?
+- Do requirements in the spec have corresponding implementation in plan/tasks?
+- Are there any contradictions between artifacts?
+
+## Completeness Analysis
+- Are all functional requirements covered?
+- Are there gaps in the implementation plan?
+- Are any edge cases or error scenarios missing?
+
+## Quality Assessment
+- Are requirements clear and testable?
+- Is the architecture sound?
+- Are tasks well-defined and actionable?
+
+## Recommendations
+- What should be addressed before implementation?
+- What could be improved or clarified?
+- Are there any risks or concerns?
+
+Generate a detailed analysis report in markdown format."""
+)
+
+_ANALYZE_PROMPT = """Analyze the following artifacts for consistency, completeness, and quality:
+
+{artifacts_text}"""
+
+_CHECKLIST_SYSTEM_PROMPT = (
+    "When asked for a quality checklist, generate a detailed checklist for the feature whose "
+    "artifacts are provided, covering:\n"
+    """
+## Pre-Implementation Checklist
+- [ ] Requirements review items
+- [ ] Design validation items
+- [ ] Dependency verification items
+
+## Implementation Checklist
+- [ ] Code quality items
+- [ ] Testing items
+- [ ] Documentation items
+
+## Pre-Deployment Checklist
+- [ ] Security review items
+- [ ] Performance validation items
+- [ ] Integration testing items
+
+## Post-Deployment Checklist
+- [ ] Monitoring setup items
+- [ ] Rollback plan items
+- [ ] Documentation updates items
+
+Each checklist item should be specific and actionable for the feature."""
+)
+
+_CHECKLIST_PROMPT = (
+    "Based on the following feature artifacts, generate a comprehensive quality checklist for this "
+    "feature.\n"
+    """
+{context}
+
+{requirements}"""
+)
+
+_CONSTITUTION_SYSTEM_PROMPT = (
+    "When asked for a project constitution, generate a comprehensive constitution document in "
+    "markdown format covering:\n"
+    """
+# Project Constitution
+
+## Core Principles
+Define the fundamental values and principles that guide all decisions in this project.
+
+## Technical Standards
+### Code Quality
+- Coding standards and best practices
+- Review requirements
+- Testing requirements
+
+### Architecture
+- Architectural principles
+- Design patterns to follow
+- Integration patterns
+
+### Security
+- Security requirements
+- Authentication/authorization standards
+- Data protection policies
+
+## Development Workflow
+### Version Control
+- Branching strategy
+- Commit message standards
+- Pull request requirements
+
+### Testing Strategy
+- Unit testing requirements
+- Integration testing requirements
+- Coverage thresholds
+
+### Documentation
+- Code documentation standards
+- API documentation requirements
+- README requirements
+
+## Quality Assurance
+- Definition of Done
+- Code review checklist
+- Quality gates
+
+## Deployment & Operations
+- Deployment process
+- Monitoring requirements
+- Incident response guidelines
+
+Each section should contain specific, actionable guidelines that team members can follow."""
+)
+
+_CONSTITUTION_PROMPT = (
+    "Create a project constitution that defines the principles, standards, and guidelines for this "
+    "project.\n"
+    """
+{principles}"""
+)
+
+_SUGGESTIONS_SYSTEM_PROMPT = """You help a developer decide what to do next in a SpecKit workflow.
 
 Available commands you can suggest:
   - /speckit.specify <description> - Create feature specification
@@ -70,7 +335,189 @@ Consider:
 
 Format your response as a brief bulleted list (2-4 items). Be specific and concrete. Include command suggestions when relevant. Start directly with the bullets, no introduction needed."""
 
+_SUGGESTIONS_USER_PROMPT = (
+    "I just completed a {command} command and generated the following content:\n"
+    """
+---
+{generated_content}
+---
+
+Based on this {command}, provide 2-4 specific, actionable suggestions for what to do next."""
+)
+
+
+# Line separating an artifact from the suggestions appended to it
+_SUGGESTIONS_MARKER = "===SUGGESTIONS==="
+
+_INLINE_SUGGESTIONS_PROMPT = (
+    "\n\n"
+    "After the {artifact}, write a line containing exactly {marker} followed by 2-4 "
+    "specific, actionable suggestions for what to do next, as a brief bulleted list. "
+    "Include SpecKit commands (/speckit.specify, /speckit.clarify, /speckit.plan, "
+    "/speckit.tasks, /speckit.implement, /speckit.analyze, /speckit.checklist, "
+    "/speckit.constitution) when relevant, and name helpful agents from this list "
+    "(used with the --agent flag):\n"
+    "{agent_list}"
+)
+
+
+# Write buffer for streamed artifacts, large enough that most responses
+# reach the disk in one write when the file is closed
+_STREAM_BUFFER_SIZE = 64 * 1024
+
+# Executor entry points running in the current call chain (see
+# CommandExecutor._saving_state); tasks inherit it, independent calls do not
+_entry_depth: ContextVar[int] = ContextVar("_entry_depth", default=0)
+
+
+async def _read_artifacts(
+    paths: Dict[str, Optional[Path]],
+    artifact_cache: Optional[Dict[Path, str]] = None
+) -> Dict[str, str]:
+    """Read existing artifact files concurrently off the event loop.
+
+    Args:
+        paths: Artifact label to file path (None entries are skipped)
+        artifact_cache: Content already known for some paths; those are not read
+
+    Returns:
+        Label to file content for the artifacts given, in the order given
+    """
+    known = artifact_cache or {}
+    existing = {label: path for label, path in paths.items() if path is not None}
+    to_read = {label: path for label, path in existing.items() if path not in known}
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(path.read_text) for path in to_read.values())
+    )
+    read = dict(zip(to_read, contents))
+    return {
+        label: read[label] if label in read else known[path]
+        for label, path in existing.items()
+    }
+
+
+def _bounded_excerpt(text: str, head: int = 1500, tail: int = 1500) -> str:
+    """Shorten text to its beginning and end.
+
+    Args:
+        text: Text to shorten
+        head: Characters to keep from the start
+        tail: Characters to keep from the end
+
+    Returns:
+        text unchanged if it is short enough, otherwise its head and tail
+        joined by a truncation marker
+    """
+    if len(text) <= head + tail + 20:
+        return text
+    return f"{text[:head]}\n...[truncated]...\n{text[-tail:]}"
+
+
+def _partition_suggestions(generated: str) -> Tuple[str, str]:
+    """Separate the suggestions an agent appended after its artifact.
+
+    Args:
+        generated: Complete generated output
+
+    Returns:
+        Tuple of (artifact content, suggestions); suggestions is empty if
+        the agent did not include any, and the content is unchanged
+    """
+    content, marker, suggestions = generated.partition(_SUGGESTIONS_MARKER)
+    if marker:
+        content = content.rstrip() + "\n"
+    return content, suggestions.strip()
+
+
+class _ArtifactStream:
+    """Forwards streamed output up to the suggestions marker.
+
+    Passes on exactly the artifact part of _partition_suggestions(): text
+    that might be the start of the marker, and whitespace that would be
+    stripped before it, is held back until the next chunk shows whether the
+    marker follows. Everything from the marker on is dropped.
+    """
+
+    def __init__(self, emit: Callable[[str], None]):
+        """Initialize artifact stream.
+
+        Args:
+            emit: Called with each piece of the artifact
+        """
+        self._emit = emit
+        self._pending = ""
+        self._ended = False
+
+    def feed(self, chunk: str) -> None:
+        """Process a piece of generated output."""
+        if self._ended:
+            return
+        text = self._pending + chunk
+
+        index = text.find(_SUGGESTIONS_MARKER)
+        if index >= 0:
+            self._ended = True
+            self._pending = ""
+            self._emit(text[:index].rstrip() + "\n")
+            return
+
+        # Hold back a possible partial marker and the whitespace before it
+        held = 0
+        for length in range(min(len(_SUGGESTIONS_MARKER) - 1, len(text)), 0, -1):
+            if _SUGGESTIONS_MARKER.startswith(text[-length:]):
+                held = length
+                break
+        cut = len(text[:len(text) - held].rstrip())
+        if cut:
+            self._emit(text[:cut])
+        self._pending = text[cut:]
+
+    def finish(self) -> None:
+        """Pass on any held-back text (the output ended without the marker)."""
+        if not self._ended and self._pending:
+            self._emit(self._pending)
+        self._pending = ""
+
+    def reset(self) -> None:
+        """Forget the output so far (generation is starting over)."""
+        self._pending = ""
+        self._ended = False
+
+
+async def generate_suggestions(
+    llm_provider: LLMProvider,
+    command_type: CommandType,
+    generated_content: str,
+    agent_manager,
+    temperature: float = 0.7
+) -> str:
+    """Generate suggestions for next steps based on completed work.
+
+    Args:
+        llm_provider: LLM provider to use
+        command_type: Type of command that was executed
+        generated_content: The content that was generated
+        agent_manager: Agent manager for listing available agents
+        temperature: Sampling temperature
+
+    Returns:
+        Markdown-formatted suggestions
+    """
+    # Static instructions go in the system message so the prompt prefix is
+    # identical across calls and can be served from the provider's cache
+    system_prompt = _SUGGESTIONS_SYSTEM_PROMPT.format(
+        agent_list=agent_manager.agent_list_markdown
+    )
+
+    suggestions_prompt = _SUGGESTIONS_USER_PROMPT.format(
+        command=command_type.value,
+        # Suggestions depend on the overall shape of the output, not every
+        # line, so keep the prompt size bounded for long generations
+        generated_content=_bounded_excerpt(generated_content)
+    )
+
     messages = [
+        Message("system", system_prompt, cache_control=True),
         Message("user", suggestions_prompt)
     ]
 
@@ -93,12 +540,27 @@ class CommandExecutor:
             config: Runner configuration
         """
         self.config = config
-        self.agent_manager = AgentManager(config.agents_dir)
-        self.llm_provider = LLMProviderFactory.create(
+        self.agent_manager = AgentManager(
+            config.agents_dir,
+            response_cache=ResponseCache(
+                directory=config.cache_dir,
+                max_age=config.cache_ttl,
+                enabled=config.enable_cache
+            )
+        )
+        self.llm_provider = LLMProviderFactory.get_or_create(
             provider_type=config.provider_type,
             api_key=config.api_key,
-            model=config.model
+            model=config.model,
+            max_connections=config.http_pool_size,
+            keepalive_expiry=config.http_keepalive_expiry
         )
+        self.model_router = ModelRouter(config)
+
+        # One state manager per feature directory, shared across commands
+        self._state_managers: Dict[Path, StateManager] = {}
+        # Background state saves not yet finished
+        self._pending: Set[asyncio.Task] = set()
 
         # Map commands to their executor methods
         self.command_handlers: Dict[CommandType, Callable] = {
@@ -129,13 +591,16 @@ class CommandExecutor:
             state: Current workflow state
             user_input: Optional user input for the command
             agent_override: Optional list of agents to use (overrides automatic selection)
-            **kwargs: Additional command-specific parameters
+            **kwargs: Additional command-specific parameters, including
+                on_chunk and on_restart callbacks to follow the generated
+                artifact as it streams (see _generate_to_file)
 
         Returns:
             Dictionary with execution results including:
                 - success: bool
                 - selected_agents: List of agent names
                 - agent_used: Name of agent that executed
+                - state: The workflow state, updated by the command
                 - other command-specific fields
 
         Raises:
@@ -147,98 +612,392 @@ class CommandExecutor:
 
         try:
             # Select agents for this command (use override if provided)
-            if agent_override:
-                selected_agents = agent_override
-            else:
-                selected_agents = self.agent_manager.select_agents_for_command(command_type)
+            selected_agents = self._resolve_agents(command_type, agent_override)
 
             # Pass selected agents to handler
-            result = await handler(feature, state, user_input, selected_agents=selected_agents, **kwargs)
+            async with self._saving_state():
+                result = await handler(
+                    feature, state, user_input, selected_agents=selected_agents, **kwargs
+                )
 
             # Ensure selected_agents is in result
             if 'selected_agents' not in result:
                 result['selected_agents'] = [agent.name for agent in selected_agents]
+            result.setdefault('state', state)
 
             return result
         except Exception as e:
             raise CommandExecutionError(f"Command {command_type} failed: {e}")
 
-    async def execute_specify(
+    async def execute_command_batch(
+        self,
+        items: List[Tuple[CommandType, Feature, WorkflowState, Optional[str]]]
+    ) -> List[Union[Dict[str, Any], CommandExecutionError]]:
+        """Execute several commands concurrently.
+
+        At most config.max_concurrency commands are in flight at once. A
+        failing command does not cancel the others; its error is returned
+        in place of its result.
+
+        Args:
+            items: (command_type, feature, state, user_input) for each command
+
+        Returns:
+            Results in the same order as items, each either the result
+            dictionary from execute_command() or the CommandExecutionError
+            raised for that command
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+
+        async def run(
+            command_type: CommandType,
+            feature: Feature,
+            state: WorkflowState,
+            user_input: Optional[str]
+        ) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_command(command_type, feature, state, user_input)
+
+        async with self._saving_state():
+            return await asyncio.gather(
+                *(run(*item) for item in items),
+                return_exceptions=True
+            )
+
+    async def execute_workflow(
         self,
         feature: Feature,
         state: WorkflowState,
-        user_input: Optional[str] = None,
-        selected_agents: Optional[list] = None,
-        **kwargs
-    ) -> Dict[str, Any]:
-        """Execute the /speckit.specify command.
+        description: str,
+        phases: Tuple[CommandType, ...] = (
+            CommandType.SPECIFY,
+            CommandType.PLAN,
+            CommandType.TASKS,
+            CommandType.IMPLEMENT,
+        )
+    ) -> List[Dict[str, Any]]:
+        """Run consecutive workflow phases for one feature.
 
-        Creates a feature specification from user description.
+        Each phase's output is handed to the later phases in memory, so
+        artifacts generated earlier in the run are not read back from disk.
 
         Args:
             feature: Current feature
             state: Current workflow state
-            user_input: Feature description from user
-            selected_agents: Pre-selected agents for this command
-            **kwargs: Additional parameters
+            description: Feature description, used as input to the specify phase
+            phases: Commands to run, in order
 
         Returns:
-            Dictionary with spec_file path and content
+            Result dictionary of each phase, in order
+
+        Raises:
+            CommandExecutionError: If a phase fails (later phases are not run)
+        """
+        artifact_cache: Dict[Path, str] = {}
+        results = []
+        async with self._saving_state():
+            for command_type in phases:
+                user_input = description if command_type == CommandType.SPECIFY else None
+                results.append(await self.execute_command(
+                    command_type,
+                    feature,
+                    state,
+                    user_input,
+                    artifact_cache=artifact_cache
+                ))
+        return results
+
+    def get_state_manager(self, spec_dir: Path) -> StateManager:
+        """Get the state manager for a feature directory, creating it on first use.
+
+        Callers loading state should use this manager too, so their reads
+        go through the same instance that schedules the background saves.
+
+        Args:
+            spec_dir: Feature specification directory
+
+        Returns:
+            StateManager for spec_dir
+        """
+        state_manager = self._state_managers.get(spec_dir)
+        if state_manager is None:
+            state_manager = StateManager(spec_dir)
+            self._state_managers[spec_dir] = state_manager
+        return state_manager
+
+    def _record_command(
+        self,
+        spec_dir: Path,
+        state: WorkflowState,
+        command_type: CommandType
+    ) -> None:
+        """Record a completed command and save the state in the background.
+
+        The save runs in a worker thread, coalesced with any other saves for
+        the same feature. The public entry point that ran the handler waits
+        for it before returning (see _saving_state).
+
+        Args:
+            spec_dir: Feature specification directory
+            state: Workflow state (already updated by the handler)
+            command_type: Command that completed
+        """
+        state_manager = self.get_state_manager(spec_dir)
+        state_manager.record_command(state, command_type, save=False)
+        task = state_manager.schedule_save(state)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    @asynccontextmanager
+    async def _saving_state(self) -> AsyncIterator[None]:
+        """Wrap a public entry point so its state saves land before it returns.
+
+        Nested entry points (e.g. execute_command called by execute_workflow)
+        leave the saves to the outermost one of their call chain, so saves
+        made during a batch or workflow are still coalesced. Independent
+        calls running at the same time each wait for the saves.
+        """
+        token = _entry_depth.set(_entry_depth.get() + 1)
+        try:
+            yield
+        finally:
+            _entry_depth.reset(token)
+            if _entry_depth.get() == 0:
+                await self.wait_pending()
+
+    async def wait_pending(self) -> None:
+        """Write background state saves now and wait for them to finish.
+
+        Raises:
+            StateSaveError: If a background save failed
+        """
+        await asyncio.gather(
+            *(manager.flush() for manager in self._state_managers.values()),
+            return_exceptions=True
+        )
+        while self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def _split_inline_suggestions(
+        self,
+        command_type: CommandType,
+        generated: str
+    ) -> Tuple[str, str]:
+        """Separate the suggestions an agent appended after its artifact.
+
+        If the agent did not include suggestions, they are generated with a
+        separate request.
+
+        Args:
+            command_type: Command that produced the output
+            generated: Complete generated output (from _generate_to_file
+                with inline_suggestions, which kept them out of the file)
+
+        Returns:
+            Tuple of (artifact content, suggestions)
+        """
+        content, suggestions = _partition_suggestions(generated)
+        if not suggestions:
+            suggestions = await generate_suggestions(
+                llm_provider=self.llm_provider,
+                command_type=command_type,
+                generated_content=content,
+                agent_manager=self.agent_manager,
+                temperature=self.config.temperature
+            )
+
+        return content, suggestions
+
+    def _resolve_agents(
+        self,
+        command_type: CommandType,
+        selected_agents: Optional[List[AgentDefinition]]
+    ) -> List[AgentDefinition]:
+        """Get the agents to run a command with.
+
+        Args:
+            command_type: Command being executed
+            selected_agents: Pre-selected or user-specified agents, if any
+
+        Returns:
+            selected_agents if non-empty, otherwise the automatic selection
+            (which falls back to the generic agent)
+
+        Raises:
+            CommandExecutionError: If no agent is available
         """
-        # Use selected agents or fallback to generic
         if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
+            selected_agents = self.agent_manager.select_agents_for_command(command_type)
 
         if not selected_agents or not selected_agents[0]:
             raise CommandExecutionError("No agents available")
 
-        # Use primary agent (first in list)
-        agent = selected_agents[0]
-
-        # Build prompt
-        user_prompt = f"""Create a detailed feature specification for:
+        return selected_agents
 
-{user_input}
+    def _provider_for_model(self, model: Optional[str]) -> LLMProvider:
+        """Get the provider for a routed model.
 
-Generate a comprehensive specification document in markdown format following this structure:
+        Args:
+            model: Model chosen by the router, or None for the configured model
 
-# Feature Specification: [Feature Name]
+        Returns:
+            Shared provider instance for that model
+        """
+        if model is None:
+            return self.llm_provider
+        return LLMProviderFactory.get_or_create(
+            provider_type=self.config.provider_type,
+            api_key=self.config.api_key,
+            model=model,
+            max_connections=self.config.http_pool_size,
+            keepalive_expiry=self.config.http_keepalive_expiry
+        )
 
-## Overview
-Brief description of the feature.
+    async def _generate_to_file(
+        self,
+        agents: List[AgentDefinition],
+        task_prompt: str,
+        output_file: Path,
+        artifact_cache: Optional[Dict[Path, str]] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        on_restart: Optional[Callable[[], None]] = None,
+        instructions: Optional[str] = None,
+        llm_provider: Optional[LLMProvider] = None,
+        inline_suggestions: bool = False
+    ) -> Tuple[AgentDefinition, str]:
+        """Run agents with fallback, writing the response to a file as it streams.
+
+        Output goes to a temporary file next to output_file and is moved into
+        place only when generation succeeds, so a failed run leaves any
+        previous version of the artifact untouched. With
+        config.parallel_fallback, all agents are queried at once and the
+        first success is written when it completes instead of streamed.
 
-## User Stories
-List prioritized user stories (P1, P2, P3, P4).
+        Args:
+            agents: Agents to try (in order)
+            task_prompt: Prompt for the agent
+            output_file: Artifact file to write
+            artifact_cache: If given, the generated content is recorded here
+                under output_file for later phases
+            on_chunk: Also called with each piece of the response as it
+                arrives (with the whole response at once if not streamed)
+            on_restart: Called when a partially delivered response is
+                discarded (see AgentManager.stream_agent)
+            instructions: Fixed task instructions sent in the cacheable
+                system prefix rather than with the task prompt
+            llm_provider: Provider to use instead of the configured one
+            inline_suggestions: The response ends with suggestions after
+                _SUGGESTIONS_MARKER; only the artifact before them is written
+                to the file, passed to on_chunk and recorded in artifact_cache
 
-## Functional Requirements
-Detailed functional requirements (FR-001, FR-002, etc.).
+        Returns:
+            Tuple of (agent_used, generated content including any suggestions)
+        """
+        llm_provider = llm_provider or self.llm_provider
+        if self.config.parallel_fallback or not llm_provider.supports_streaming():
+            agent_used, content = await self.agent_manager.execute_with_fallback(
+                agents=agents,
+                llm_provider=llm_provider,
+                task_prompt=task_prompt,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                race=self.config.parallel_fallback,
+                instructions=instructions
+            )
+            artifact = _partition_suggestions(content)[0] if inline_suggestions else content
+            await asyncio.to_thread(output_file.write_text, artifact)
+            if on_chunk is not None:
+                on_chunk(artifact)
+        else:
+            temp_file = output_file.with_name(output_file.name + '.tmp')
+            try:
+                # Chunks are buffered in memory; opening, the final flush and
+                # the rename run in a worker thread
+                f = await asyncio.to_thread(
+                    open, temp_file, 'w', buffering=_STREAM_BUFFER_SIZE
+                )
+                try:
+                    def write(text: str) -> None:
+                        f.write(text)
+                        if on_chunk is not None:
+                            on_chunk(text)
+
+                    sink = write if on_chunk is not None else f.write
+                    # Suggestions never reach the file or the live view
+                    artifact_stream = _ArtifactStream(sink) if inline_suggestions else None
+
+                    def restart() -> None:
+                        f.seek(0)
+                        f.truncate()
+                        if artifact_stream is not None:
+                            artifact_stream.reset()
+                        if on_restart is not None:
+                            on_restart()
+
+                    agent_used, content = await self.agent_manager.execute_with_fallback_stream(
+                        agents=agents,
+                        llm_provider=llm_provider,
+                        task_prompt=task_prompt,
+                        on_chunk=artifact_stream.feed if artifact_stream is not None else sink,
+                        on_restart=restart,
+                        temperature=self.config.temperature,
+                        max_tokens=self.config.max_tokens,
+                        instructions=instructions
+                    )
+                    if artifact_stream is not None:
+                        artifact_stream.finish()
+                finally:
+                    await asyncio.to_thread(f.close)
+                await asyncio.to_thread(temp_file.replace, output_file)
+            except BaseException:
+                temp_file.unlink(missing_ok=True)
+                raise
+
+        if artifact_cache is not None:
+            artifact_cache[output_file] = (
+                _partition_suggestions(content)[0] if inline_suggestions else content
+            )
+
+        return agent_used, content
 
-## Non-Functional Requirements
-Performance, security, scalability requirements.
+    async def execute_specify(
+        self,
+        feature: Feature,
+        state: WorkflowState,
+        user_input: Optional[str] = None,
+        selected_agents: Optional[list] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Execute the /speckit.specify command.
 
-## Constraints & Dependencies
-Technical constraints and external dependencies.
+        Creates a feature specification from user description.
 
-## Edge Cases & Error Handling
-Expected edge cases and how to handle them.
+        Args:
+            feature: Current feature
+            state: Current workflow state
+            user_input: Feature description from user
+            selected_agents: Pre-selected agents for this command
+            **kwargs: Additional parameters
 
-Please generate the complete specification document now."""
+        Returns:
+            Dictionary with spec_file path and content
+        """
+        selected_agents = self._resolve_agents(CommandType.SPECIFY, selected_agents)
 
-        # Execute with agent and automatic fallback
-        agent_used, spec_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
-        )
+        # Build prompt
+        user_prompt = _SPECIFY_PROMPT.format(user_input=user_input)
 
         # Ensure directory exists
         feature.spec_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write specification file
-        with open(feature.spec_file, 'w') as f:
-            f.write(spec_content)
+        # Execute with agent and automatic fallback, streaming into the file
+        agent_used, spec_content = await self._generate_to_file(
+            selected_agents, user_prompt, feature.spec_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_SPECIFY_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -249,11 +1008,10 @@ Please generate the complete specification document now."""
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
+        # Update state (saved in the background)
         state.current_phase = WorkflowPhase.SPECIFY
-        state_manager.record_command(state, CommandType.SPECIFY)
         state.suggested_next = CommandType.PLAN
+        self._record_command(feature.spec_dir, state, CommandType.SPECIFY)
 
         return {
             "spec_file": str(feature.spec_file),
@@ -290,64 +1048,25 @@ Please generate the complete specification document now."""
         if not feature.spec_file.exists():
             raise CommandExecutionError("Specification file not found. Run /speckit.specify first.")
 
-        with open(feature.spec_file, 'r') as f:
-            spec_content = f.read()
-
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.PLAN)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
+        artifacts = await _read_artifacts(
+            {'spec': feature.spec_file}, kwargs.get('artifact_cache')
+        )
+        spec_content = artifacts['spec']
 
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        selected_agents = self._resolve_agents(CommandType.PLAN, selected_agents)
 
         # Build prompt
-        user_prompt = f"""Based on the following feature specification, create a detailed implementation plan.
+        user_prompt = _PLAN_PROMPT.format(spec_content=spec_content)
 
-## Specification:
-{spec_content}
-
-Generate a comprehensive implementation plan in markdown format following this structure:
-
-# Implementation Plan
-
-## Technical Context
-Technologies, frameworks, and tools to be used.
-
-## Architecture & Design
-High-level architecture and component design.
-
-## Data Model
-Key entities and their relationships.
-
-## API Contracts
-Interface definitions and contracts.
-
-## Testing Strategy
-Approach to testing and validation.
-
-## Deployment Plan
-How the feature will be deployed.
-
-Please generate the complete implementation plan now."""
-
-        # Execute with agent and automatic fallback
-        agent_used, plan_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
-        )
-
-        # Write plan file
+        # Execute with agent and automatic fallback, streaming into the file
         plan_file = feature.spec_dir / "plan.md"
-        with open(plan_file, 'w') as f:
-            f.write(plan_content)
-
-        feature.plan_file = plan_file
+        agent_used, plan_content = await self._generate_to_file(
+            selected_agents, user_prompt, plan_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_PLAN_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -358,11 +1077,12 @@ Please generate the complete implementation plan now."""
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
+        feature.plan_file = plan_file
+
+        # Update state (saved in the background)
         state.current_phase = WorkflowPhase.PLAN
-        state_manager.record_command(state, CommandType.PLAN)
         state.suggested_next = CommandType.TASKS
+        self._record_command(feature.spec_dir, state, CommandType.PLAN)
 
         return {
             "plan_file": str(plan_file),
@@ -396,72 +1116,35 @@ Please generate the complete implementation plan now."""
             Dictionary with tasks_file path and content
         """
         # Read the plan
-        if not feature.plan_file or not feature.plan_file.exists():
+        present = feature.artifact_presence()
+        if not present.plan:
             raise CommandExecutionError("Plan file not found. Run /speckit.plan first.")
 
-        with open(feature.plan_file, 'r') as f:
-            plan_content = f.read()
-
-        # Also read spec for context
-        spec_content = ""
-        if feature.spec_file.exists():
-            with open(feature.spec_file, 'r') as f:
-                spec_content = f.read()
-
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.TASKS)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
-
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
-
-        # Build prompt
-        user_prompt = f"""Based on the following specification and implementation plan, create a detailed task breakdown.
-
-## Specification:
-{spec_content}
-
-## Implementation Plan:
-{plan_content}
-
-Generate a comprehensive task list in markdown format following this structure:
-
-# Implementation Tasks
-
-## Phase 1: Setup
-- [ ] T001 [P1] Task description with file path
-
-## Phase 2: Core Implementation
-- [ ] T002 [P1] Task description with file path
-
-... organize tasks by phase and priority ...
-
-Each task should:
-- Have a unique ID (T001, T002, etc.)
-- Include priority (P1, P2, P3, P4)
-- Have a clear, actionable description
-- Specify the file or component to be modified
-
-Please generate the complete task breakdown now."""
+        # Read plan and spec (for context) together
+        artifacts = await _read_artifacts({
+            'plan': present.plan,
+            'spec': present.spec,
+        }, kwargs.get('artifact_cache'))
+        plan_content = artifacts['plan']
+        spec_content = artifacts.get('spec', "")
 
-        # Execute with agent and automatic fallback
-        agent_used, tasks_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
+        selected_agents = self._resolve_agents(CommandType.TASKS, selected_agents)
+
+        # Build prompt
+        user_prompt = _TASKS_PROMPT.format(
+            spec_content=spec_content,
+            plan_content=plan_content
         )
 
-        # Write tasks file
+        # Execute with agent and automatic fallback, streaming into the file
         tasks_file = feature.spec_dir / "tasks.md"
-        with open(tasks_file, 'w') as f:
-            f.write(tasks_content)
-
-        feature.tasks_file = tasks_file
+        agent_used, tasks_content = await self._generate_to_file(
+            selected_agents, user_prompt, tasks_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_TASKS_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -472,11 +1155,12 @@ Please generate the complete task breakdown now."""
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
+        feature.tasks_file = tasks_file
+
+        # Update state (saved in the background)
         state.current_phase = WorkflowPhase.TASKS
-        state_manager.record_command(state, CommandType.TASKS)
         state.suggested_next = CommandType.IMPLEMENT
+        self._record_command(feature.spec_dir, state, CommandType.TASKS)
 
         return {
             "tasks_file": str(tasks_file),
@@ -509,85 +1193,40 @@ Please generate the complete task breakdown now."""
         Returns:
             Dictionary with implementation results
         """
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.IMPLEMENT)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
-
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        selected_agents = self._resolve_agents(CommandType.IMPLEMENT, selected_agents)
 
         # Read required artifacts
-        if not feature.tasks_file or not feature.tasks_file.exists():
+        present = feature.artifact_presence()
+        if not present.tasks:
             raise CommandExecutionError("Tasks file not found. Run /speckit.tasks first.")
 
-        with open(feature.tasks_file, 'r') as f:
-            tasks_content = f.read()
-
-        # Read spec and plan for context
-        context = ""
-        if feature.spec_file.exists():
-            with open(feature.spec_file, 'r') as f:
-                context += f"\n## Specification:\n{f.read()}\n"
-
-        if feature.plan_file and feature.plan_file.exists():
-            with open(feature.plan_file, 'r') as f:
-                context += f"\n## Plan:\n{f.read()}\n"
+        # Read tasks along with spec and plan for context
+        artifacts = await _read_artifacts({
+            'Tasks': present.tasks,
+            'Specification': present.spec,
+            'Plan': present.plan,
+        }, kwargs.get('artifact_cache'))
+        tasks_content = artifacts.pop('Tasks')
+        context = "".join(f"\n## {heading}:\n{content}\n" for heading, content in artifacts.items())
 
         # Build prompt
         task_filter = f"\n\nFocus on: {user_input}" if user_input else ""
 
-        user_prompt = f"""Generate detailed implementation guidance based on the following tasks and context.
-
-{context}
-
-## Tasks:
-{tasks_content}
-
-{task_filter}
-
-For each task (or the specified tasks), provide:
-
-## Implementation Guidance
-
-For each task, include:
-
-### [Task ID]: [Task Description]
-
-**Implementation Approach:**
-- Step-by-step approach to implement this task
-- Key considerations and gotchas
-- Suggested file structure or changes
-
-**Code Snippets/Pseudocode:**
-- Relevant code examples or pseudocode
-- API signatures or interfaces to implement
-
-**Testing Guidance:**
-- How to test this implementation
-- Key test cases to cover
-
-**Dependencies:**
-- What needs to be done first
-- What other tasks this affects
-
-Provide concrete, actionable guidance that a developer can use to implement each task."""
-
-        # Execute with agent and automatic fallback
-        agent_used, implementation_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
+        user_prompt = _IMPLEMENT_PROMPT.format(
+            context=context,
+            tasks_content=tasks_content,
+            task_filter=task_filter
         )
 
-        # Write implementation guidance file
+        # Execute with agent and automatic fallback, streaming into the file
         implementation_file = feature.spec_dir / "implementation.md"
-        with open(implementation_file, 'w') as f:
-            f.write(implementation_content)
+        agent_used, implementation_content = await self._generate_to_file(
+            selected_agents, user_prompt, implementation_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_IMPLEMENT_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -598,10 +1237,9 @@ Provide concrete, actionable guidance that a developer can use to implement each
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
+        # Update state (saved in the background)
         state.current_phase = WorkflowPhase.IMPLEMENT
-        state_manager.record_command(state, CommandType.IMPLEMENT)
+        self._record_command(feature.spec_dir, state, CommandType.IMPLEMENT)
 
         return {
             "implementation_file": str(implementation_file),
@@ -638,48 +1276,25 @@ Provide concrete, actionable guidance that a developer can use to implement each
         if not feature.spec_file.exists():
             raise CommandExecutionError("Specification file not found.")
 
-        with open(feature.spec_file, 'r') as f:
-            spec_content = f.read()
-
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.CLARIFY)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
+        artifacts = await _read_artifacts(
+            {'spec': feature.spec_file}, kwargs.get('artifact_cache')
+        )
+        spec_content = artifacts['spec']
 
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        selected_agents = self._resolve_agents(CommandType.CLARIFY, selected_agents)
 
         # Build prompt
-        user_prompt = f"""Analyze the following specification and identify any ambiguities or underspecified areas.
-
-## Specification:
-{spec_content}
-
-Generate up to 5 clarification questions that would help resolve ambiguities. Format as:
+        user_prompt = _CLARIFY_PROMPT.format(spec_content=spec_content)
 
-## Clarification Questions
-
-1. **Question**: [Clear question]
-   - Context: [Why this matters]
-   - Options: [Possible answers]
-
-Please generate the clarification questions now."""
-
-        # Execute with agent and automatic fallback
-        agent_used, clarifications = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
-        )
-
-        # Write clarifications to file
+        # Execute with agent and automatic fallback, streaming into the file
         clarify_file = feature.spec_dir / "clarifications.md"
-        with open(clarify_file, 'w') as f:
-            f.write(clarifications)
+        agent_used, clarifications = await self._generate_to_file(
+            selected_agents, user_prompt, clarify_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_CLARIFY_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -690,9 +1305,8 @@ Please generate the clarification questions now."""
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
-        state_manager.record_command(state, CommandType.CLARIFY)
+        # Update state (saved in the background)
+        self._record_command(feature.spec_dir, state, CommandType.CLARIFY)
 
         return {
             "clarify_file": str(clarify_file),
@@ -725,78 +1339,35 @@ Please generate the clarification questions now."""
         Returns:
             Dictionary with analysis results
         """
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.ANALYZE)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
-
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        selected_agents = self._resolve_agents(CommandType.ANALYZE, selected_agents)
 
         # Read all available artifacts
-        artifacts = {}
-
-        if feature.spec_file.exists():
-            with open(feature.spec_file, 'r') as f:
-                artifacts['spec.md'] = f.read()
-
-        if feature.plan_file and feature.plan_file.exists():
-            with open(feature.plan_file, 'r') as f:
-                artifacts['plan.md'] = f.read()
-
-        if feature.tasks_file and feature.tasks_file.exists():
-            with open(feature.tasks_file, 'r') as f:
-                artifacts['tasks.md'] = f.read()
+        present = feature.artifact_presence()
+        artifacts = await _read_artifacts({
+            'spec.md': present.spec,
+            'plan.md': present.plan,
+            'tasks.md': present.tasks,
+        }, kwargs.get('artifact_cache'))
 
         if not artifacts:
             raise CommandExecutionError("No artifacts found to analyze. Run /speckit.specify first.")
 
         # Build analysis prompt
-        artifacts_text = "\n\n---\n\n".join([f"## {name}\n\n{content}" for name, content in artifacts.items()])
-
-        user_prompt = f"""Analyze the following artifacts for consistency, completeness, and quality:
-
-{artifacts_text}
-
-Please provide a comprehensive analysis covering:
-
-## Consistency Analysis
-- Are the plan and tasks aligned with the specification?
-- Do requirements in the spec have corresponding implementation in plan/tasks?
-- Are there any contradictions between artifacts?
-
-## Completeness Analysis
-- Are all functional requirements covered?
-- Are there gaps in the implementation plan?
-- Are any edge cases or error scenarios missing?
-
-## Quality Assessment
-- Are requirements clear and testable?
-- Is the architecture sound?
-- Are tasks well-defined and actionable?
-
-## Recommendations
-- What should be addressed before implementation?
-- What could be improved or clarified?
-- Are there any risks or concerns?
-
-Generate a detailed analysis report in markdown format."""
-
-        # Execute with agent and automatic fallback
-        agent_used, analysis_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
+        artifacts_text = "\n\n---\n\n".join(
+            f"## {name}\n\n{content}" for name, content in artifacts.items()
         )
 
-        # Write analysis file
+        user_prompt = _ANALYZE_PROMPT.format(artifacts_text=artifacts_text)
+
+        # Execute with agent and automatic fallback, streaming into the file
         analysis_file = feature.spec_dir / "analysis.md"
-        with open(analysis_file, 'w') as f:
-            f.write(analysis_content)
+        agent_used, analysis_content = await self._generate_to_file(
+            selected_agents, user_prompt, analysis_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=_ANALYZE_SYSTEM_PROMPT
+        )
 
         # Generate suggestions for next steps
         suggestions = await generate_suggestions(
@@ -807,9 +1378,8 @@ Generate a detailed analysis report in markdown format."""
             temperature=self.config.temperature
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
-        state_manager.record_command(state, CommandType.ANALYZE)
+        # Update state (saved in the background)
+        self._record_command(feature.spec_dir, state, CommandType.ANALYZE)
 
         return {
             "analysis_file": str(analysis_file),
@@ -842,100 +1412,169 @@ Generate a detailed analysis report in markdown format."""
         Returns:
             Dictionary with checklist
         """
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.CHECKLIST)
+        selected_agents = self._resolve_agents(CommandType.CHECKLIST, selected_agents)
 
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
+        # Build prompt from the available artifacts
+        context, user_prompt, instructions = await self._build_checklist_prompt(
+            feature, user_input, kwargs.get('artifact_cache')
+        )
 
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        # Small checklists can use a cheaper model
+        model = self.model_router.choose_model(CommandType.CHECKLIST, context, user_input)
 
-        # Read available artifacts for context
-        context = ""
+        # Execute with agent and automatic fallback, streaming into the file
+        checklist_file = feature.spec_dir / "checklist.md"
+        agent_used, checklist_content = await self._generate_to_file(
+            selected_agents, user_prompt, checklist_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=instructions,
+            llm_provider=self._provider_for_model(model),
+            inline_suggestions=True
+        )
 
-        if feature.spec_file.exists():
-            with open(feature.spec_file, 'r') as f:
-                context += f"\n## Specification:\n{f.read()}\n"
+        # Split off the suggestions for next steps
+        checklist_content, suggestions = await self._split_inline_suggestions(
+            CommandType.CHECKLIST, checklist_content
+        )
 
-        if feature.plan_file and feature.plan_file.exists():
-            with open(feature.plan_file, 'r') as f:
-                context += f"\n## Plan:\n{f.read()}\n"
+        # Update state (saved in the background)
+        self._record_command(feature.spec_dir, state, CommandType.CHECKLIST)
 
-        if feature.tasks_file and feature.tasks_file.exists():
-            with open(feature.tasks_file, 'r') as f:
-                context += f"\n## Tasks:\n{f.read()}\n"
+        return {
+            "checklist_file": str(checklist_file),
+            "content": checklist_content,
+            "suggestions": suggestions,
+            "selected_agents": [agent.name for agent in selected_agents],
+            "agent_used": agent_used.name,
+            "success": True
+        }
 
-        if not context:
-            raise CommandExecutionError("No artifacts found. Run /speckit.specify first.")
+    async def execute_checklist_bulk(
+        self,
+        features: List[Feature],
+        user_input: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate checklists for many features in one provider batch.
 
-        # Build prompt
-        user_prompt = f"""Based on the following feature artifacts, generate a comprehensive quality checklist for this feature.
+        For non-interactive bulk regeneration (e.g. CI). All requests use the
+        first agent selected for checklists and go through the provider's
+        batch interface, which for Anthropic is the Message Batches API:
+        cheaper, but it can take minutes. There is no per-agent fallback.
 
-{context}
+        Args:
+            features: Features to generate checklists for
+            user_input: Checklist requirements applied to every feature
 
-{f"Additional requirements: {user_input}" if user_input else ""}
+        Returns:
+            Result dictionary for each feature, in order (as from
+            execute_checklist)
 
-Generate a detailed checklist covering:
+        Raises:
+            CommandExecutionError: If a feature has no artifacts or no agent
+                is available
+            AgentExecutionError: If the batch fails
+        """
+        agent = self._resolve_agents(CommandType.CHECKLIST, None)[0]
 
-## Pre-Implementation Checklist
-- [ ] Requirements review items
-- [ ] Design validation items
-- [ ] Dependency verification items
+        prompts = await asyncio.gather(
+            *(self._build_checklist_prompt(feature, user_input) for feature in features)
+        )
+        # The instructions are the same for every feature
+        instructions = prompts[0][2] if prompts else None
 
-## Implementation Checklist
-- [ ] Code quality items
-- [ ] Testing items
-- [ ] Documentation items
+        contents = await self.agent_manager.execute_bulk(
+            agent=agent,
+            llm_provider=self.llm_provider,
+            task_prompts=[user_prompt for _, user_prompt, _ in prompts],
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            instructions=instructions
+        )
 
-## Pre-Deployment Checklist
-- [ ] Security review items
-- [ ] Performance validation items
-- [ ] Integration testing items
+        async def finish(feature: Feature, generated: str) -> Dict[str, Any]:
+            # Split off inline suggestions first so the file is written once
+            checklist_file = feature.spec_dir / "checklist.md"
+            checklist_content, suggestions = _partition_suggestions(generated)
+            await asyncio.to_thread(checklist_file.write_text, checklist_content)
+            if not suggestions:
+                suggestions = await generate_suggestions(
+                    llm_provider=self.llm_provider,
+                    command_type=CommandType.CHECKLIST,
+                    generated_content=checklist_content,
+                    agent_manager=self.agent_manager,
+                    temperature=self.config.temperature
+                )
+            return {
+                "checklist_file": str(checklist_file),
+                "content": checklist_content,
+                "suggestions": suggestions,
+                "selected_agents": [agent.name],
+                "agent_used": agent.name,
+                "success": True
+            }
+
+        async with self._saving_state():
+            results = await asyncio.gather(
+                *(finish(feature, generated) for feature, generated in zip(features, contents))
+            )
+
+            # Update state (saved in the background). A save still pending
+            # for the feature is written first, so the load does not miss it
+            for feature in features:
+                state_manager = self.get_state_manager(feature.spec_dir)
+                await state_manager.flush()
+                state = await asyncio.to_thread(state_manager.load_state, feature.id)
+                self._record_command(feature.spec_dir, state, CommandType.CHECKLIST)
+
+        return list(results)
+
+    async def _build_checklist_prompt(
+        self,
+        feature: Feature,
+        user_input: Optional[str] = None,
+        artifact_cache: Optional[Dict[Path, str]] = None
+    ) -> Tuple[str, str, str]:
+        """Build the checklist prompt from a feature's artifacts.
 
-## Post-Deployment Checklist
-- [ ] Monitoring setup items
-- [ ] Rollback plan items
-- [ ] Documentation updates items
+        Args:
+            feature: Feature to build the checklist for
+            user_input: Checklist requirements
+            artifact_cache: Content already known for some artifacts
 
-Each checklist item should be specific and actionable for this feature."""
+        Returns:
+            Tuple of (artifact context, user prompt, fixed instructions)
 
-        # Execute with agent and automatic fallback
-        agent_used, checklist_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
-        )
+        Raises:
+            CommandExecutionError: If the feature has no artifacts
+        """
+        # Read available artifacts for context
+        present = feature.artifact_presence()
+        artifacts = await _read_artifacts({
+            'Specification': present.spec,
+            'Plan': present.plan,
+            'Tasks': present.tasks,
+        }, artifact_cache)
+        context = "".join(f"\n## {heading}:\n{content}\n" for heading, content in artifacts.items())
 
-        # Write checklist file
-        checklist_file = feature.spec_dir / "checklist.md"
-        with open(checklist_file, 'w') as f:
-            f.write(checklist_content)
+        if not context:
+            raise CommandExecutionError("No artifacts found. Run /speckit.specify first.")
 
-        # Generate suggestions for next steps
-        suggestions = await generate_suggestions(
-            llm_provider=self.llm_provider,
-            command_type=CommandType.CHECKLIST,
-            generated_content=checklist_content,
-            agent_manager=self.agent_manager,
-            temperature=self.config.temperature
+        user_prompt = _CHECKLIST_PROMPT.format(
+            context=context,
+            requirements=f"Additional requirements: {user_input}" if user_input else ""
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
-        state_manager.record_command(state, CommandType.CHECKLIST)
+        # The fixed instructions go in the cacheable system prefix. Suggestions
+        # are requested in the same call to save a round trip.
+        instructions = _CHECKLIST_SYSTEM_PROMPT + _INLINE_SUGGESTIONS_PROMPT.format(
+            artifact="checklist",
+            marker=_SUGGESTIONS_MARKER,
+            agent_list=self.agent_manager.agent_list_markdown
+        )
 
-        return {
-            "checklist_file": str(checklist_file),
-            "content": checklist_content,
-            "suggestions": suggestions,
-            "selected_agents": [agent.name for agent in selected_agents],
-            "agent_used": agent_used.name,
-            "success": True
-        }
+        return context, user_prompt, instructions
 
     async def execute_constitution(
         self,
@@ -959,99 +1598,45 @@ Each checklist item should be specific and actionable for this feature."""
         Returns:
             Dictionary with constitution
         """
-        # Use selected agents or fallback to generic
-        if not selected_agents:
-            selected_agents = self.agent_manager.select_agents_for_command(CommandType.CONSTITUTION)
-
-        if not selected_agents:
-            selected_agents = [self.agent_manager.get_generic_agent()]
-
-        if not selected_agents or not selected_agents[0]:
-            raise CommandExecutionError("No agents available")
+        selected_agents = self._resolve_agents(CommandType.CONSTITUTION, selected_agents)
 
         # Build prompt
-        user_prompt = f"""Create a project constitution that defines the principles, standards, and guidelines for this project.
-
-{f"User-provided principles: {user_input}" if user_input else ""}
-
-Generate a comprehensive constitution document in markdown format covering:
-
-# Project Constitution
-
-## Core Principles
-Define the fundamental values and principles that guide all decisions in this project.
-
-## Technical Standards
-### Code Quality
-- Coding standards and best practices
-- Review requirements
-- Testing requirements
-
-### Architecture
-- Architectural principles
-- Design patterns to follow
-- Integration patterns
-
-### Security
-- Security requirements
-- Authentication/authorization standards
-- Data protection policies
-
-## Development Workflow
-### Version Control
-- Branching strategy
-- Commit message standards
-- Pull request requirements
-
-### Testing Strategy
-- Unit testing requirements
-- Integration testing requirements
-- Coverage thresholds
-
-### Documentation
-- Code documentation standards
-- API documentation requirements
-- README requirements
-
-## Quality Assurance
-- Definition of Done
-- Code review checklist
-- Quality gates
-
-## Deployment & Operations
-- Deployment process
-- Monitoring requirements
-- Incident response guidelines
-
-Each section should contain specific, actionable guidelines that team members can follow."""
+        user_prompt = _CONSTITUTION_PROMPT.format(
+            principles=f"User-provided principles: {user_input}" if user_input else ""
+        )
 
-        # Execute with agent and automatic fallback
-        agent_used, constitution_content = await self.agent_manager.execute_with_fallback(
-            agents=selected_agents,
-            llm_provider=self.llm_provider,
-            task_prompt=user_prompt,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
+        # The fixed instructions go in the cacheable system prefix. Suggestions
+        # are requested in the same call to save a round trip.
+        instructions = _CONSTITUTION_SYSTEM_PROMPT + _INLINE_SUGGESTIONS_PROMPT.format(
+            artifact="constitution",
+            marker=_SUGGESTIONS_MARKER,
+            agent_list=self.agent_manager.agent_list_markdown
         )
 
-        # Write constitution file to project root (not feature-specific)
+        # The constitution prompt is small unless the user supplies long principles
+        model = self.model_router.choose_model(CommandType.CONSTITUTION, "", user_input)
+
+        # Constitution lives at the project root (not feature-specific)
+        # Execute with agent and automatic fallback, streaming into the file
         constitution_file = self.config.workspace_root / "CONSTITUTION.md"
-        with open(constitution_file, 'w') as f:
-            f.write(constitution_content)
+        agent_used, constitution_content = await self._generate_to_file(
+            selected_agents, user_prompt, constitution_file,
+            artifact_cache=kwargs.get('artifact_cache'),
+            on_chunk=kwargs.get('on_chunk'),
+            on_restart=kwargs.get('on_restart'),
+            instructions=instructions,
+            llm_provider=self._provider_for_model(model),
+            inline_suggestions=True
+        )
 
-        # Generate suggestions for next steps
-        suggestions = await generate_suggestions(
-            llm_provider=self.llm_provider,
-            command_type=CommandType.CONSTITUTION,
-            generated_content=constitution_content,
-            agent_manager=self.agent_manager,
-            temperature=self.config.temperature
+        # Split off the suggestions for next steps
+        constitution_content, suggestions = await self._split_inline_suggestions(
+            CommandType.CONSTITUTION, constitution_content
         )
 
-        # Update state
-        state_manager = StateManager(feature.spec_dir)
+        # Update state (saved in the background)
         state.current_phase = WorkflowPhase.CONSTITUTION
-        state_manager.record_command(state, CommandType.CONSTITUTION)
+        self._record_command(feature.spec_dir, state, CommandType.CONSTITUTION)
 
         return {
             "constitution_file": str(constitution_file),
@@ -1,15 +1,18 @@
 """Configuration management for DeepAgents Runner."""
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 
 from deepagents_runner.models import ProviderType
 from deepagents_runner.utils.exceptions import ProviderConfigError
+from deepagents_runner.utils.files import user_cache_dir
 
 
-@dataclass
+@dataclass(slots=True)
 class RunnerConfig:
     """Configuration for the DeepAgents Runner."""
 
@@ -28,6 +31,14 @@ class RunnerConfig:
     max_tokens: Optional[int] = None
     retry_attempts: int = 2
     retry_backoff_factor: float = 2.0
+    max_concurrency: int = 4
+    cache_dir: Optional[Path] = None
+    enable_cache: bool = True
+    cache_ttl: float = 86400.0
+    http_pool_size: int = 32
+    http_keepalive_expiry: float = 60.0
+    parallel_fallback: bool = False
+    budget_mode: bool = False
 
     def __post_init__(self):
         """Initialize derived paths."""
@@ -38,6 +49,9 @@ class RunnerConfig:
             # Default to bundled agents
             self.agents_dir = Path(__file__).parent.parent.parent / "agents"
 
+        if self.cache_dir is None:
+            self.cache_dir = user_cache_dir() / "responses"
+
 
 class ConfigLoader:
     """Loads configuration from environment variables and files."""
@@ -46,6 +60,10 @@ class ConfigLoader:
     def load_from_env() -> RunnerConfig:
         """Load configuration from environment variables.
 
+        The environment is read once per process; each call returns a new
+        copy of that configuration, which the caller may modify. Call
+        ConfigLoader.clear_cache() to pick up environment changes.
+
         Environment variables:
             ANTHROPIC_API_KEY: Anthropic API key
             OPENAI_API_KEY: OpenAI API key
@@ -53,6 +71,14 @@ class ConfigLoader:
             RUNNER_MODEL: Model name to use
             RUNNER_TEMPERATURE: Sampling temperature (0.0-1.0)
             RUNNER_MAX_TOKENS: Maximum tokens to generate
+            RUNNER_MAX_CONCURRENCY: Maximum commands run at once by batch execution
+            RUNNER_CACHE_DIR: Directory for persisted LLM responses
+            RUNNER_ENABLE_CACHE: Reuse responses to identical low-temperature requests (true/false)
+            RUNNER_CACHE_TTL: Seconds a cached response stays valid
+            RUNNER_HTTP_POOL_SIZE: Maximum HTTP connections to the provider API
+            RUNNER_HTTP_KEEPALIVE: Seconds idle API connections are kept open
+            RUNNER_PARALLEL_FALLBACK: Query all selected agents at once (true/false)
+            RUNNER_BUDGET_MODE: Prefer the cheaper model tier when no model is set (true/false)
 
         Returns:
             RunnerConfig instance
@@ -60,8 +86,21 @@ class ConfigLoader:
         Raises:
             ProviderConfigError: If configuration is invalid or incomplete
         """
+        return copy.copy(ConfigLoader._env_config())
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget the configuration read from the environment."""
+        ConfigLoader._env_config.cache_clear()
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _env_config() -> RunnerConfig:
+        """Read configuration from the environment (see load_from_env)."""
+        env = dict(os.environ)
+
         # Determine provider and API key
-        provider_name = os.getenv("RUNNER_DEFAULT_PROVIDER", "anthropic").lower()
+        provider_name = env.get("RUNNER_DEFAULT_PROVIDER", "anthropic").lower()
 
         try:
             provider_type = ProviderType(provider_name)
@@ -73,14 +112,14 @@ class ConfigLoader:
 
         # Get API key for selected provider
         if provider_type == ProviderType.ANTHROPIC:
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = env.get("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ProviderConfigError(
                     "ANTHROPIC_API_KEY environment variable is required "
                     "when using Anthropic provider"
                 )
         elif provider_type == ProviderType.OPENAI:
-            api_key = os.getenv("OPENAI_API_KEY")
+            api_key = env.get("OPENAI_API_KEY")
             if not api_key:
                 raise ProviderConfigError(
                     "OPENAI_API_KEY environment variable is required "
@@ -90,17 +129,36 @@ class ConfigLoader:
             raise ProviderConfigError(f"Unsupported provider: {provider_type}")
 
         # Load optional settings
-        model = os.getenv("RUNNER_MODEL")
-        temperature = float(os.getenv("RUNNER_TEMPERATURE", "0.7"))
-        max_tokens_str = os.getenv("RUNNER_MAX_TOKENS")
+        model = env.get("RUNNER_MODEL")
+        temperature = float(env.get("RUNNER_TEMPERATURE", "0.7"))
+        max_tokens_str = env.get("RUNNER_MAX_TOKENS")
         max_tokens = int(max_tokens_str) if max_tokens_str else None
+        max_concurrency = int(env.get("RUNNER_MAX_CONCURRENCY", "4"))
+        cache_dir_str = env.get("RUNNER_CACHE_DIR")
+        cache_dir = Path(cache_dir_str) if cache_dir_str else None
+        enable_cache = env.get("RUNNER_ENABLE_CACHE", "true").lower() in ("1", "true", "yes")
+        cache_ttl = float(env.get("RUNNER_CACHE_TTL", "86400"))
+        http_pool_size = int(env.get("RUNNER_HTTP_POOL_SIZE", "32"))
+        http_keepalive_expiry = float(env.get("RUNNER_HTTP_KEEPALIVE", "60"))
+        parallel_fallback = (
+            env.get("RUNNER_PARALLEL_FALLBACK", "false").lower() in ("1", "true", "yes")
+        )
+        budget_mode = env.get("RUNNER_BUDGET_MODE", "false").lower() in ("1", "true", "yes")
 
         return RunnerConfig(
             provider_type=provider_type,
             api_key=api_key,
             model=model,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            max_concurrency=max_concurrency,
+            cache_dir=cache_dir,
+            enable_cache=enable_cache,
+            cache_ttl=cache_ttl,
+            http_pool_size=http_pool_size,
+            http_keepalive_expiry=http_keepalive_expiry,
+            parallel_fallback=parallel_fallback,
+            budget_mode=budget_mode
         )
 
     @staticmethod
@@ -128,25 +186,29 @@ class ConfigLoader:
         # Override with command-line arguments
         if provider:
             try:
-                config.provider_type = ProviderType(provider.lower())
+                provider_type = ProviderType(provider.lower())
             except ValueError:
                 raise ProviderConfigError(f"Invalid provider: {provider}")
 
-            # Re-fetch API key for overridden provider
-            if config.provider_type == ProviderType.ANTHROPIC:
-                api_key = os.getenv("ANTHROPIC_API_KEY")
-                if not api_key:
-                    raise ProviderConfigError(
-                        "ANTHROPIC_API_KEY environment variable is required"
-                    )
-                config.api_key = api_key
-            elif config.provider_type == ProviderType.OPENAI:
-                api_key = os.getenv("OPENAI_API_KEY")
-                if not api_key:
-                    raise ProviderConfigError(
-                        "OPENAI_API_KEY environment variable is required"
-                    )
-                config.api_key = api_key
+            # The environment config already has the key for its own provider
+            if provider_type != config.provider_type:
+                config.provider_type = provider_type
+
+                # Fetch API key for overridden provider
+                if config.provider_type == ProviderType.ANTHROPIC:
+                    api_key = os.getenv("ANTHROPIC_API_KEY")
+                    if not api_key:
+                        raise ProviderConfigError(
+                            "ANTHROPIC_API_KEY environment variable is required"
+                        )
+                    config.api_key = api_key
+                elif config.provider_type == ProviderType.OPENAI:
+                    api_key = os.getenv("OPENAI_API_KEY")
+                    if not api_key:
+                        raise ProviderConfigError(
+                            "OPENAI_API_KEY environment variable is required"
+                        )
+                    config.api_key = api_key
 
         if model:
             config.model = model
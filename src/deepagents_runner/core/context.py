@@ -1,8 +1,10 @@
 """Context detection for automatic feature identification."""
 
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, Tuple
 
 from deepagents_runner.models.feature import Feature
 from deepagents_runner.models import FeatureStatus
@@ -10,6 +12,15 @@ from deepagents_runner.utils.git import get_current_branch
 from deepagents_runner.utils.exceptions import ContextDetectionError
 
 
+@lru_cache(maxsize=8)
+def _parse_branch(branch: str) -> Optional[Tuple[str, str]]:
+    """Split a feature branch name into (feature_id, feature_name), or None."""
+    match = ContextDetector.BRANCH_PATTERN.match(branch)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
 class ContextDetector:
     """Detects feature context from git branch and filesystem."""
 
@@ -34,48 +45,49 @@ class ContextDetector:
             ContextDetectionError: If branch pattern matches but feature not found
         """
         branch = get_current_branch()
-        if not branch:
+        if not branch or branch == "HEAD":
+            # Not in a repository, or detached HEAD
             return None
 
-        match = self.BRANCH_PATTERN.match(branch)
-        if not match:
+        parsed = _parse_branch(branch)
+        if not parsed:
             return None
 
-        feature_id = match.group(1)
-        feature_name = match.group(2)
+        feature_id, feature_name = parsed
+        return self._build_feature(feature_id, feature_name, branch)
 
-        # Build feature paths
+    def _build_feature(self, feature_id: str, feature_name: str, branch: str) -> Feature:
+        """Build a Feature from what exists in its spec directory."""
         spec_dir = self.specs_dir / f"{feature_id}-{feature_name}"
-        spec_file = spec_dir / "spec.md"
-        plan_file = spec_dir / "plan.md"
-        tasks_file = spec_dir / "tasks.md"
-
-        # Determine status based on what files exist
-        status = self._determine_status(spec_file, plan_file, tasks_file)
+        names = self._list_spec_dir(spec_dir)
 
         return Feature(
             id=feature_id,
             name=feature_name,
             branch=branch,
             spec_dir=spec_dir,
-            spec_file=spec_file,
-            plan_file=plan_file if plan_file.exists() else None,
-            tasks_file=tasks_file if tasks_file.exists() else None,
-            status=status
+            spec_file=spec_dir / "spec.md",
+            plan_file=spec_dir / "plan.md" if "plan.md" in names else None,
+            tasks_file=spec_dir / "tasks.md" if "tasks.md" in names else None,
+            status=self._determine_status(names)
         )
 
-    def _determine_status(
-        self,
-        spec_file: Path,
-        plan_file: Path,
-        tasks_file: Path
-    ) -> FeatureStatus:
-        """Determine feature status from filesystem."""
-        if tasks_file.exists():
+    @staticmethod
+    def _list_spec_dir(spec_dir: Path) -> Set[str]:
+        """List file names in a spec directory with a single directory read."""
+        try:
+            with os.scandir(spec_dir) as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
+
+    def _determine_status(self, names: Set[str]) -> FeatureStatus:
+        """Determine feature status from the files in its spec directory."""
+        if "tasks.md" in names:
             return FeatureStatus.TASKED
-        elif plan_file.exists():
+        elif "plan.md" in names:
             return FeatureStatus.PLANNED
-        elif spec_file.exists():
+        elif "spec.md" in names:
             return FeatureStatus.SPECIFIED
         else:
             return FeatureStatus.DRAFT
@@ -90,21 +102,4 @@ class ContextDetector:
         Returns:
             Feature object
         """
-        spec_dir = self.specs_dir / f"{feature_id}-{feature_name}"
-        spec_file = spec_dir / "spec.md"
-        plan_file = spec_dir / "plan.md"
-        tasks_file = spec_dir / "tasks.md"
-
-        branch = f"{feature_id}-{feature_name}"
-        status = self._determine_status(spec_file, plan_file, tasks_file)
-
-        return Feature(
-            id=feature_id,
-            name=feature_name,
-            branch=branch,
-            spec_dir=spec_dir,
-            spec_file=spec_file,
-            plan_file=plan_file if plan_file.exists() else None,
-            tasks_file=tasks_file if tasks_file.exists() else None,
-            status=status
-        )
+        return self._build_feature(feature_id, feature_name, f"{feature_id}-{feature_name}")
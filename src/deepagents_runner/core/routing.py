@@ -0,0 +1,93 @@
+"""Model routing by task size."""
+
+import logging
+from typing import Dict, Optional
+
+from deepagents_runner.core.config import RunnerConfig
+from deepagents_runner.models import CommandType, ProviderType
+
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    """Chooses a cheaper, faster model for small tasks.
+
+    Routing only applies when no model is configured (RUNNER_MODEL or
+    --model); an explicitly chosen model is always used as is.
+    """
+
+    # Low-cost model tier for each provider
+    ECONOMY_MODELS: Dict[ProviderType, str] = {
+        ProviderType.ANTHROPIC: "claude-haiku-4-5",
+        ProviderType.OPENAI: "gpt-4o-mini",
+    }
+
+    # Commands whose output holds up on the economy tier for small inputs
+    ECONOMY_COMMANDS = frozenset({CommandType.CHECKLIST, CommandType.CONSTITUTION})
+
+    # Estimated input tokens below which the economy tier is used
+    TOKEN_THRESHOLD = 2000
+    BUDGET_TOKEN_THRESHOLD = 8000
+
+    def __init__(self, config: RunnerConfig):
+        """Initialize model router.
+
+        Args:
+            config: Runner configuration (provider, model, budget_mode)
+        """
+        self.config = config
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Roughly estimate the token count of text.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Estimated number of tokens
+        """
+        return int(len(text.split()) * 1.3)
+
+    def choose_model(
+        self,
+        command_type: CommandType,
+        context: str,
+        user_input: Optional[str] = None
+    ) -> Optional[str]:
+        """Choose the model for a command.
+
+        In budget mode larger inputs still go to the economy tier.
+
+        Args:
+            command_type: Command being executed
+            context: Feature artifacts included in the prompt
+            user_input: Additional user input included in the prompt
+
+        Returns:
+            Model name to use, or None to use the configured model
+        """
+        if self.config.model:
+            return None
+
+        economy_model = self.ECONOMY_MODELS.get(self.config.provider_type)
+        if economy_model is None:
+            return None
+
+        if command_type not in self.ECONOMY_COMMANDS:
+            return None
+
+        threshold = self.BUDGET_TOKEN_THRESHOLD if self.config.budget_mode else self.TOKEN_THRESHOLD
+
+        tokens = self.estimate_tokens(context)
+        if user_input:
+            tokens += self.estimate_tokens(user_input)
+        if tokens >= threshold:
+            return None
+
+        logger.info(
+            "Routing %s to %s (~%d input tokens)",
+            command_type.value, economy_model, tokens
+        )
+        return economy_model
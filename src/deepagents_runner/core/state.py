@@ -1,8 +1,12 @@
 """State management for workflow persistence."""
 
+import asyncio
+import copy
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 from deepagents_runner.models.workflow import WorkflowState, CommandRecord
 from deepagents_runner.models import WorkflowPhase, CommandType
@@ -10,11 +14,34 @@ from deepagents_runner.utils.files import read_json, write_json
 from deepagents_runner.utils.exceptions import StateLoadError, StateSaveError
 
 
+def _epoch_ms(value: Union[int, str]) -> int:
+    """Convert a stored command timestamp to epoch milliseconds.
+
+    State files store ISO 8601 strings; integers are accepted too.
+    """
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    return value
+
+
+def _stored_timestamp(epoch_ms: int) -> datetime:
+    """Convert a command timestamp to the datetime stored in state files.
+
+    Written as ISO 8601 (as by earlier versions), so older releases can
+    still read the file.
+    """
+    seconds, millis = divmod(epoch_ms, 1000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=millis * 1000)
+
+
 class StateManager:
     """Manages workflow state persistence."""
 
     STATE_FILENAME = "workflow.json"
 
+    # Saves scheduled within this many seconds of each other are coalesced
+    SAVE_DELAY = 0.25
+
     def __init__(self, feature_spec_dir: Path):
         """Initialize state manager.
 
@@ -24,6 +51,12 @@ class StateManager:
         self.feature_spec_dir = feature_spec_dir
         self.state_dir = feature_spec_dir / ".state"
         self.state_file = self.state_dir / self.STATE_FILENAME
+        # Saves may run in worker threads; keep them from interleaving
+        self._save_lock = threading.Lock()
+        # Latest state waiting for a scheduled save, and the task that saves it
+        self._unsaved_state: Optional[WorkflowState] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_now: Optional[asyncio.Event] = None
 
     def load_state(self, feature_id: str) -> WorkflowState:
         """Load workflow state from disk.
@@ -52,7 +85,7 @@ class StateManager:
             completed_commands = [
                 CommandRecord(
                     command=CommandType(rec['command']),
-                    timestamp=datetime.fromisoformat(rec['timestamp'])
+                    timestamp=_epoch_ms(rec['timestamp'])
                 )
                 for rec in data.get('completed_commands', [])
             ]
@@ -79,39 +112,112 @@ class StateManager:
         Raises:
             StateSaveError: If state cannot be saved
         """
+        self._write_snapshot(self._snapshot(state))
+
+    async def save_state_async(self, state: WorkflowState) -> None:
+        """Save workflow state to disk in a worker thread.
+
+        The state is copied into a snapshot on the calling thread, so the
+        worker never reads the WorkflowState while the event loop may be
+        changing it.
+
+        Args:
+            state: WorkflowState to persist
+
+        Raises:
+            StateSaveError: If state cannot be saved
+        """
+        await asyncio.to_thread(self._write_snapshot, self._snapshot(state))
+
+    def schedule_save(self, state: WorkflowState) -> asyncio.Task:
+        """Save workflow state shortly, in the background.
+
+        Saves requested within SAVE_DELAY of each other are coalesced into a
+        single write of the latest state. Must be called from a running
+        event loop; use flush() to write without waiting for the delay.
+
+        Args:
+            state: WorkflowState to persist
+
+        Returns:
+            Task that completes once the state has been written
+        """
+        self._unsaved_state = state
+        if self._save_task is None or self._save_task.done():
+            self._save_now = asyncio.Event()
+            self._save_task = asyncio.create_task(self._delayed_save(self._save_now))
+        return self._save_task
+
+    async def flush(self) -> None:
+        """Write any scheduled save now and wait for it to finish.
+
+        Raises:
+            StateSaveError: If state cannot be saved
+        """
+        if self._save_task is None or self._save_task.done():
+            return
+        self._save_now.set()
+        await self._save_task
+
+    async def _delayed_save(self, save_now: asyncio.Event) -> None:
+        """Wait for SAVE_DELAY (or flush()), then write the latest state."""
+        try:
+            await asyncio.wait_for(save_now.wait(), self.SAVE_DELAY)
+        except asyncio.TimeoutError:
+            pass
+
+        # Keep going if another save was scheduled while writing
+        while self._unsaved_state is not None:
+            state, self._unsaved_state = self._unsaved_state, None
+            await self.save_state_async(state)
+
+    @staticmethod
+    def _snapshot(state: WorkflowState) -> Dict[str, Any]:
+        """Update the state's timestamp and copy it into a serializable dict."""
         # Update timestamp
         state.last_updated = datetime.now()
 
-        # Convert to dict
-        data = {
+        # Convert to dict (write_json serializes datetimes as ISO 8601)
+        return {
             'feature_id': state.feature_id,
             'current_phase': state.current_phase.value,
             'completed_commands': [
                 {
                     'command': cmd.command.value,
-                    'timestamp': cmd.timestamp.isoformat()
+                    'timestamp': _stored_timestamp(cmd.timestamp)
                 }
                 for cmd in state.completed_commands
             ],
             'suggested_next': state.suggested_next.value if state.suggested_next else None,
-            'context_data': state.context_data,
-            'last_checkpoint': state.last_checkpoint.isoformat(),
-            'last_updated': state.last_updated.isoformat()
+            'context_data': copy.deepcopy(state.context_data),
+            'last_checkpoint': state.last_checkpoint,
+            'last_updated': state.last_updated
         }
 
-        write_json(self.state_file, data)
-
-    def record_command(self, state: WorkflowState, command: CommandType) -> None:
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """Write a state snapshot; saves from worker threads do not interleave."""
+        with self._save_lock:
+            write_json(self.state_file, data)
+
+    def record_command(
+        self,
+        state: WorkflowState,
+        command: CommandType,
+        save: bool = True
+    ) -> None:
         """Record a completed command.
 
         Args:
             state: Current workflow state
             command: Command that was executed
+            save: Save the state immediately (pass False when the caller
+                saves it later, e.g. with schedule_save())
         """
         state.completed_commands.append(
-            CommandRecord(command=command, timestamp=datetime.now())
+            CommandRecord(command=command, timestamp=time.time_ns() // 1_000_000)
         )
-        self.save_state(state)
+        if save:
+            self.save_state(state)
 
     def update_phase(self, state: WorkflowState, phase: WorkflowPhase) -> None:
         """Update current workflow phase.
@@ -1,13 +1,22 @@
 """Anthropic Claude LLM provider."""
 
-from typing import List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
 import anthropic
 
-from deepagents_runner.llm.base import LLMProvider, Message
+from deepagents_runner.llm.base import (
+    LLMProvider,
+    Message,
+    pool_limits,
+    shared_client,
+    split_messages,
+)
 from deepagents_runner.utils.exceptions import (
+    AuthenticationError,
     ProviderError,
     ProviderNotAvailableError,
     RateLimitError,
+    TransientError,
 )
 
 
@@ -16,23 +25,142 @@ class AnthropicProvider(LLMProvider):
 
     DEFAULT_MODEL = "claude-sonnet-4-5"
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    # Smaller batches are sent as individual requests; the Message Batches
+    # API trades latency (minutes or more) for half-price tokens
+    BATCH_API_MIN_REQUESTS = 4
+    BATCH_POLL_INTERVAL = 10.0
+
+    def __init__(self, api_key: str, model: Optional[str] = None, **pool_options):
         """Initialize Anthropic provider.
 
         Args:
             api_key: Anthropic API key
             model: Model name (defaults to Claude 3.5 Sonnet)
+            **pool_options: HTTP pool settings (see LLMProvider)
         """
-        super().__init__(api_key, model)
+        super().__init__(api_key, model, **pool_options)
+        self._client: Optional[anthropic.AsyncAnthropic] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Messages from the last request and their converted form; retries
+        # resend the same messages
+        self._converted: Optional[Tuple[Tuple[Message, ...], Any]] = None
         try:
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self._client = shared_client(self.client_key, None, self._new_client)
         except Exception as e:
             raise ProviderNotAvailableError(f"Failed to initialize Anthropic client: {e}")
 
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Async client usable from the running event loop.
+
+        The client is shared with other providers using the same API key
+        and pool settings. Pooled connections belong to the event loop that
+        opened them, so a fresh client is created when the provider is used
+        from a new loop (e.g. by each asyncio.run call).
+        """
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._client = shared_client(self.client_key, loop, self._new_client)
+            self._client_loop = loop
+        return self._client
+
+    def _new_client(self) -> anthropic.AsyncAnthropic:
+        """Create an async client with a keep-alive connection pool."""
+        limits = pool_limits(anthropic, self.max_connections, self.keepalive_expiry)
+        return anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=limits)
+        )
+
+    async def prewarm(self) -> None:
+        """Open a pooled connection with a cheap model listing request."""
+        try:
+            await self.client.models.list(limit=1)
+        except Exception:
+            # Only an optimization; the first real request reports any problem
+            pass
+
     def get_default_model(self) -> str:
         """Get the default model name."""
         return self.DEFAULT_MODEL
 
+    @staticmethod
+    def _content_blocks(msg: Message) -> Union[str, List[Dict[str, Any]]]:
+        """Convert message content, adding a cache breakpoint when requested.
+
+        Args:
+            msg: Message to convert
+
+        Returns:
+            Plain text, or a text block list carrying cache_control
+        """
+        if not msg.cache_control:
+            return msg.content
+        return [{
+            "type": "text",
+            "text": msg.content,
+            "cache_control": {"type": "ephemeral"}
+        }]
+
+    def _convert_messages(
+        self,
+        messages: List[Message]
+    ) -> Tuple[Optional[Union[str, List[Dict[str, Any]]]], List[Dict[str, Any]]]:
+        """Split messages into the Anthropic system prompt and conversation.
+
+        Args:
+            messages: List of messages in the conversation
+
+        Returns:
+            Tuple of (system prompt or None, conversation messages)
+        """
+        system_message, conversation = split_messages(messages)
+        return (
+            self._content_blocks(system_message) if system_message else None,
+            [{"role": msg.role, "content": self._content_blocks(msg)} for msg in conversation]
+        )
+
+    def _build_params(
+        self,
+        messages: List[Message],
+        temperature: float,
+        max_tokens: Optional[int],
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build Messages API request parameters.
+
+        The message conversion is reused when the same messages are sent
+        again (as on a retry).
+
+        Args:
+            messages: List of messages in the conversation
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate (default: 4096)
+            options: Additional Anthropic-specific options
+
+        Returns:
+            Keyword arguments for messages.create / messages.stream
+        """
+        # Message has identity equality, so this compares the message objects
+        key = tuple(messages)
+        if self._converted is None or self._converted[0] != key:
+            self._converted = (key, self._convert_messages(messages))
+        system_message, conversation_messages = self._converted[1]
+
+        request_params = {
+            "model": self.model,
+            "messages": conversation_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens or 4096,
+            **options
+        }
+
+        # Anthropic expects system messages separate from conversation
+        if system_message:
+            request_params["system"] = system_message
+
+        return request_params
+
     async def generate(
         self,
         messages: List[Message],
@@ -56,40 +184,24 @@ class AnthropicProvider(LLMProvider):
             RateLimitError: If rate limit is exceeded
         """
         try:
-            # Convert messages to Anthropic format
-            # Anthropic expects system messages separate from conversation
-            system_message = None
-            conversation_messages = []
-
-            for msg in messages:
-                if msg.role == "system":
-                    system_message = msg.content
-                else:
-                    conversation_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-
-            # Build request parameters
-            request_params = {
-                "model": self.model,
-                "messages": conversation_messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 4096,
-                **kwargs
-            }
-
-            if system_message:
-                request_params["system"] = system_message
+            request_params = self._build_params(messages, temperature, max_tokens, kwargs)
 
             # Make API call
-            response = self.client.messages.create(**request_params)
+            response = await self.client.messages.create(**request_params)
 
-            # Extract text from response
-            return response.content[0].text
+            # Join all text blocks (other block types, e.g. tool use, carry no text)
+            return "".join(block.text for block in response.content if block.type == "text")
 
         except anthropic.RateLimitError as e:
             raise RateLimitError(f"Anthropic rate limit exceeded: {e}")
+        except (anthropic.AuthenticationError, anthropic.PermissionDeniedError) as e:
+            raise AuthenticationError(f"Anthropic authentication failed: {e}")
+        except anthropic.APIConnectionError as e:
+            raise TransientError(f"Anthropic connection error: {e}")
+        except anthropic.APIStatusError as e:
+            if e.status_code >= 500:
+                raise TransientError(f"Anthropic server error: {e}")
+            raise ProviderError(f"Anthropic API error: {e}")
         except anthropic.APIError as e:
             raise ProviderError(f"Anthropic API error: {e}")
         except Exception as e:
@@ -118,39 +230,132 @@ class AnthropicProvider(LLMProvider):
             RateLimitError: If rate limit is exceeded
         """
         try:
-            # Convert messages to Anthropic format
-            system_message = None
-            conversation_messages = []
-
-            for msg in messages:
-                if msg.role == "system":
-                    system_message = msg.content
-                else:
-                    conversation_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-
-            # Build request parameters
-            request_params = {
-                "model": self.model,
-                "messages": conversation_messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 4096,
-                **kwargs
-            }
-
-            if system_message:
-                request_params["system"] = system_message
+            request_params = self._build_params(messages, temperature, max_tokens, kwargs)
 
             # Make streaming API call
-            with self.client.messages.stream(**request_params) as stream:
-                for text in stream.text_stream:
+            async with self.client.messages.stream(**request_params) as stream:
+                async for text in stream.text_stream:
                     yield text
 
         except anthropic.RateLimitError as e:
             raise RateLimitError(f"Anthropic rate limit exceeded: {e}")
+        except (anthropic.AuthenticationError, anthropic.PermissionDeniedError) as e:
+            raise AuthenticationError(f"Anthropic authentication failed: {e}")
+        except anthropic.APIConnectionError as e:
+            raise TransientError(f"Anthropic connection error: {e}")
+        except anthropic.APIStatusError as e:
+            if e.status_code >= 500:
+                raise TransientError(f"Anthropic server error: {e}")
+            raise ProviderError(f"Anthropic API error: {e}")
         except anthropic.APIError as e:
             raise ProviderError(f"Anthropic API error: {e}")
         except Exception as e:
             raise ProviderError(f"Unexpected error during Anthropic streaming: {e}")
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Message]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[str, Exception]]:
+        """Generate responses for several conversations with the Message Batches API.
+
+        Waits for the whole batch to finish, polling every
+        BATCH_POLL_INTERVAL seconds; if the wait is cancelled, the batch is
+        cancelled on the server too. Batches smaller than
+        BATCH_API_MIN_REQUESTS are sent as concurrent individual requests.
+
+        Args:
+            conversations: Messages for each request
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate (default: 4096)
+            return_exceptions: Return a ProviderError in place of each request
+                that errored, was canceled or expired, instead of raising, so
+                the responses that succeeded are kept
+            **kwargs: Additional Anthropic-specific options
+
+        Returns:
+            Generated response text for each conversation (or, with
+            return_exceptions, its error), in order
+
+        Raises:
+            ProviderError: If the batch fails, or any request in it fails
+                (without return_exceptions)
+            RateLimitError: If rate limit is exceeded
+        """
+        if len(conversations) < self.BATCH_API_MIN_REQUESTS:
+            return await super().generate_batch(
+                conversations, temperature, max_tokens, return_exceptions, **kwargs
+            )
+
+        requests = [
+            {
+                "custom_id": f"request-{index}",
+                "params": self._build_params(messages, temperature, max_tokens, kwargs)
+            }
+            for index, messages in enumerate(conversations)
+        ]
+
+        try:
+            batches = self.client.messages.batches
+            batch = await batches.create(requests=requests)
+            try:
+                while batch.processing_status != "ended":
+                    await asyncio.sleep(self.BATCH_POLL_INTERVAL)
+                    batch = await batches.retrieve(batch.id)
+            except asyncio.CancelledError:
+                # Nobody will collect the results; stop paying for them
+                try:
+                    await batches.cancel(batch.id)
+                except Exception:
+                    pass
+                raise
+
+            responses: Dict[str, str] = {}
+            failures: Dict[str, str] = {}
+            async for entry in await batches.results(batch.id):
+                if entry.result.type == "succeeded":
+                    responses[entry.custom_id] = "".join(
+                        block.text for block in entry.result.message.content if block.type == "text"
+                    )
+                else:
+                    failures[entry.custom_id] = entry.result.type
+
+        except anthropic.RateLimitError as e:
+            raise RateLimitError(f"Anthropic rate limit exceeded: {e}")
+        except (anthropic.AuthenticationError, anthropic.PermissionDeniedError) as e:
+            raise AuthenticationError(f"Anthropic authentication failed: {e}")
+        except anthropic.APIConnectionError as e:
+            raise TransientError(f"Anthropic connection error: {e}")
+        except anthropic.APIStatusError as e:
+            if e.status_code >= 500:
+                raise TransientError(f"Anthropic server error: {e}")
+            raise ProviderError(f"Anthropic API error: {e}")
+        except anthropic.APIError as e:
+            raise ProviderError(f"Anthropic API error: {e}")
+        except Exception as e:
+            raise ProviderError(f"Unexpected error during Anthropic batch generation: {e}")
+
+        if return_exceptions:
+            results: List[Union[str, Exception]] = []
+            for request in requests:
+                custom_id = request["custom_id"]
+                if custom_id in responses:
+                    results.append(responses[custom_id])
+                else:
+                    results.append(ProviderError(
+                        f"Anthropic batch {batch.id} request {custom_id}: "
+                        + failures.get(custom_id, "missing result")
+                    ))
+            return results
+
+        if failures or len(responses) != len(requests):
+            raise ProviderError(
+                f"Anthropic batch {batch.id} had failed requests: "
+                + (", ".join(f"{custom_id}: {kind}" for custom_id, kind in failures.items())
+                   or "missing results")
+            )
+
+        return [responses[request["custom_id"]] for request in requests]
@@ -1,39 +1,146 @@
 """Base LLM provider interface."""
 
+import asyncio
+import hashlib
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
 
 
 class Message:
-    """Represents a chat message."""
+    """Represents a chat message.
 
-    def __init__(self, role: str, content: str):
+    Messages are not modified after construction, so providers may reuse
+    anything derived from them.
+    """
+
+    __slots__ = ("role", "content", "cache_control", "_dict")
+
+    def __init__(self, role: str, content: str, cache_control: bool = False):
         """Initialize message.
 
         Args:
             role: Message role (system, user, assistant)
             content: Message content
+            cache_control: Mark this message as a stable prompt prefix that
+                providers supporting explicit prompt caching should cache
         """
         self.role = role
         self.content = content
+        self.cache_control = cache_control
+        self._dict: Optional[Dict[str, str]] = None
 
     def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary."""
-        return {"role": self.role, "content": self.content}
+        """Convert to dictionary (built once, then shared; do not modify)."""
+        if self._dict is None:
+            self._dict = {"role": self.role, "content": self.content}
+        return self._dict
+
+
+def split_messages(messages: List[Message]) -> Tuple[Optional[Message], List[Message]]:
+    """Separate the system prompt from the conversation.
+
+    For APIs that take the system prompt as a separate parameter. If there
+    are several system messages, the last one is used.
+
+    Args:
+        messages: List of messages in the conversation
+
+    Returns:
+        Tuple of (system message or None, remaining messages in order)
+    """
+    system_message = None
+    conversation = []
+    for msg in messages:
+        if msg.role == "system":
+            system_message = msg
+        else:
+            conversation.append(msg)
+    return system_message, conversation
+
+
+def pool_limits(sdk: Any, max_connections: int, keepalive_expiry: float) -> Any:
+    """Build HTTP connection pool limits for a vendor SDK's client.
+
+    The limits object is created from the same class as the SDK's
+    DEFAULT_CONNECTION_LIMITS, so it matches the HTTP library build the SDK
+    is using.
+
+    Args:
+        sdk: Vendor SDK module (anthropic or openai)
+        max_connections: Maximum open connections (all may be kept alive)
+        keepalive_expiry: Seconds an idle connection is kept open
+
+    Returns:
+        Limits instance to pass to the SDK's default HTTP client
+    """
+    return type(sdk.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+
+
+# SDK clients shared by provider instances with the same credentials and pool
+# settings (e.g. the same API key used with different models), each with the
+# event loop it is bound to (None until first used)
+_shared_clients: Dict[Tuple[Any, ...], Tuple[Optional[asyncio.AbstractEventLoop], Any]] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def shared_client(
+    key: Tuple[Any, ...],
+    loop: Optional[asyncio.AbstractEventLoop],
+    factory: Callable[[], Any]
+) -> Any:
+    """Get the SDK client shared by all providers with the same key.
+
+    Pooled connections belong to one event loop. A client not yet used
+    from any loop is adopted by the first loop that asks for it; a client
+    bound to another loop is replaced.
+
+    Args:
+        key: Identifies the credentials and pool settings
+        loop: Event loop the client will be used from (None: not yet known)
+        factory: Creates a new client
+
+    Returns:
+        Shared client instance
+    """
+    with _shared_clients_lock:
+        entry = _shared_clients.get(key)
+        if entry is not None and (loop is None or entry[0] in (None, loop)):
+            client = entry[1]
+            bound_loop = loop or entry[0]
+        else:
+            client = factory()
+            bound_loop = loop
+        _shared_clients[key] = (bound_loop, client)
+        return client
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        model: Optional[str] = None,
+        max_connections: int = 32,
+        keepalive_expiry: float = 60.0
+    ):
         """Initialize provider.
 
         Args:
             api_key: API key for the provider
             model: Model name (uses default if not specified)
+            max_connections: Size of the HTTP connection pool to the API
+            keepalive_expiry: Seconds an idle pooled connection is kept open
         """
         self.api_key = api_key
         self.model = model or self.get_default_model()
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
 
     @abstractmethod
     def get_default_model(self) -> str:
@@ -92,6 +199,61 @@ class LLMProvider(ABC):
         """
         pass
 
+    @property
+    def client_key(self) -> Tuple[Any, ...]:
+        """Key under which this provider's SDK client is shared (see shared_client)."""
+        return (
+            type(self).__name__,
+            hashlib.sha256(self.api_key.encode('utf-8')).hexdigest(),
+            self.max_connections,
+            self.keepalive_expiry
+        )
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Message]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[str, Exception]]:
+        """Generate responses for several independent conversations.
+
+        The default sends the requests concurrently. Providers with a
+        discounted batch API override this for large batches.
+
+        Args:
+            conversations: Messages for each request
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            return_exceptions: Return the error of a failed request in its
+                place instead of raising it, so the other responses are kept
+            **kwargs: Provider-specific options
+
+        Returns:
+            Generated response text for each conversation (or, with
+            return_exceptions, its error), in order
+
+        Raises:
+            ProviderError: If any generation fails (without return_exceptions)
+        """
+        return list(await asyncio.gather(
+            *(
+                self.generate(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+                for messages in conversations
+            ),
+            return_exceptions=return_exceptions
+        ))
+
+    async def prewarm(self) -> None:
+        """Open a connection to the API ahead of the first request.
+
+        Providers that pool connections override this to make a cheap request
+        so the first real generation does not pay for the TCP/TLS handshake.
+        Failures are ignored.
+        """
+        return None
+
     def supports_streaming(self) -> bool:
         """Check if this provider supports streaming.
 
@@ -1,22 +1,28 @@
 """LLM provider factory."""
 
-from typing import Optional
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
 from deepagents_runner.models import ProviderType
 from deepagents_runner.llm.base import LLMProvider
-from deepagents_runner.llm.anthropic_provider import AnthropicProvider
-from deepagents_runner.llm.openai_provider import OpenAIProvider
 from deepagents_runner.utils.exceptions import ProviderConfigError
 
 
 class LLMProviderFactory:
     """Factory for creating LLM provider instances."""
 
+    # Shared providers keyed by (provider type, API key digest, model), most
+    # recently used last
+    MAX_SHARED_PROVIDERS = 8
+    _shared: "OrderedDict[Tuple[Any, ...], LLMProvider]" = OrderedDict()
+
     @staticmethod
     def create(
         provider_type: ProviderType,
         api_key: str,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        **pool_options
     ) -> LLMProvider:
         """Create an LLM provider instance.
 
@@ -24,6 +30,7 @@ class LLMProviderFactory:
             provider_type: Type of provider to create
             api_key: API key for the provider
             model: Optional model name (uses provider default if not specified)
+            **pool_options: HTTP pool settings (max_connections, keepalive_expiry)
 
         Returns:
             LLMProvider instance
@@ -31,13 +38,63 @@ class LLMProviderFactory:
         Raises:
             ProviderConfigError: If provider type is invalid
         """
+        # Provider modules are imported on demand so that only the SDK in use
+        # is loaded at startup
         if provider_type == ProviderType.ANTHROPIC:
-            return AnthropicProvider(api_key=api_key, model=model)
+            from deepagents_runner.llm.anthropic_provider import AnthropicProvider
+            return AnthropicProvider(api_key=api_key, model=model, **pool_options)
         elif provider_type == ProviderType.OPENAI:
-            return OpenAIProvider(api_key=api_key, model=model)
+            from deepagents_runner.llm.openai_provider import OpenAIProvider
+            return OpenAIProvider(api_key=api_key, model=model, **pool_options)
         else:
             raise ProviderConfigError(f"Unsupported provider type: {provider_type}")
 
+    @classmethod
+    def get_or_create(
+        cls,
+        provider_type: ProviderType,
+        api_key: str,
+        model: Optional[str] = None,
+        **pool_options
+    ) -> LLMProvider:
+        """Get a shared LLM provider instance, creating it on first use.
+
+        Reusing the instance keeps its HTTP client and connection pool alive
+        across command executors in the same process.
+
+        Args:
+            provider_type: Type of provider
+            api_key: API key for the provider
+            model: Optional model name (uses provider default if not specified)
+            **pool_options: HTTP pool settings (max_connections, keepalive_expiry)
+
+        Returns:
+            LLMProvider instance shared by all callers with the same settings
+
+        Raises:
+            ProviderConfigError: If provider type is invalid
+        """
+        key = (
+            provider_type,
+            hashlib.sha256(api_key.encode('utf-8')).hexdigest(),
+            model,
+            tuple(sorted(pool_options.items()))
+        )
+        provider = cls._shared.get(key)
+        if provider is None:
+            provider = cls.create(provider_type, api_key, model, **pool_options)
+            cls._shared[key] = provider
+            while len(cls._shared) > cls.MAX_SHARED_PROVIDERS:
+                cls._shared.popitem(last=False)
+        else:
+            cls._shared.move_to_end(key)
+        return provider
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        """Drop all shared provider instances."""
+        cls._shared.clear()
+
     @staticmethod
     def create_from_string(
         provider_name: str,
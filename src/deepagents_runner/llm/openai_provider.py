@@ -1,34 +1,80 @@
 """OpenAI GPT LLM provider."""
 
-from typing import List, Optional
+import asyncio
+import importlib.util
+from typing import Dict, List, Optional, Tuple, Union
 import openai
 
-from deepagents_runner.llm.base import LLMProvider, Message
+from deepagents_runner.llm.base import LLMProvider, Message, pool_limits, shared_client
 from deepagents_runner.utils.exceptions import (
+    AuthenticationError,
     ProviderError,
     ProviderNotAvailableError,
     RateLimitError,
+    TransientError,
 )
 
 
+# HTTP/2 support in the SDK's HTTP client needs the optional h2 package
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT provider implementation."""
 
     DEFAULT_MODEL = "gpt-4o"
 
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    def __init__(self, api_key: str, model: Optional[str] = None, **pool_options):
         """Initialize OpenAI provider.
 
         Args:
             api_key: OpenAI API key
             model: Model name (defaults to GPT-4o)
+            **pool_options: HTTP pool settings (see LLMProvider)
         """
-        super().__init__(api_key, model)
+        super().__init__(api_key, model, **pool_options)
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         try:
-            self.client = openai.OpenAI(api_key=api_key)
+            self._client = shared_client(self.client_key, None, self._new_client)
         except Exception as e:
             raise ProviderNotAvailableError(f"Failed to initialize OpenAI client: {e}")
 
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """Async client usable from the running event loop.
+
+        The client is shared with other providers using the same API key
+        and pool settings. Pooled connections belong to the event loop that
+        opened them, so a fresh client is created when the provider is used
+        from a new loop (e.g. by each asyncio.run call).
+        """
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._client = shared_client(self.client_key, loop, self._new_client)
+            self._client_loop = loop
+        return self._client
+
+    def _new_client(self) -> openai.AsyncOpenAI:
+        """Create an async client with a keep-alive connection pool.
+
+        Requests are multiplexed over HTTP/2 when the optional h2 package is
+        installed (pip install deepagents-runner[http2]).
+        """
+        limits = pool_limits(openai, self.max_connections, self.keepalive_expiry)
+        return openai.AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=openai.DefaultAsyncHttpxClient(limits=limits, http2=_HTTP2_AVAILABLE)
+        )
+
+    async def prewarm(self) -> None:
+        """Open a pooled connection with a cheap model listing request."""
+        try:
+            await self.client.models.list()
+        except Exception:
+            # Only an optimization; the first real request reports any problem
+            pass
+
     def get_default_model(self) -> str:
         """Get the default model name."""
         return self.DEFAULT_MODEL
@@ -51,12 +97,97 @@ class OpenAIProvider(LLMProvider):
         Returns:
             Generated response text
 
+        Raises:
+            ProviderError: If generation fails
+            RateLimitError: If rate limit is exceeded
+        """
+        return (await self._complete(messages, 1, temperature, max_tokens, **kwargs))[0]
+
+    async def generate_batch(
+        self,
+        conversations: List[List[Message]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[str, Exception]]:
+        """Generate responses for several conversations.
+
+        Identical conversations are sent as one request with n set to the
+        number of copies, so the shared input is billed once and counts as a
+        single request against the rate limit. Distinct conversations are
+        sent concurrently over the shared connection pool.
+
+        Args:
+            conversations: Messages for each request
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            return_exceptions: Return the error of a failed request in place
+                of each conversation it was for, instead of raising it
+            **kwargs: Additional OpenAI-specific options
+
+        Returns:
+            Generated response text for each conversation (or, with
+            return_exceptions, its error), in order
+
+        Raises:
+            ProviderError: If any generation fails (without return_exceptions)
+            RateLimitError: If rate limit is exceeded (without return_exceptions)
+        """
+        groups: Dict[Tuple[Tuple[str, str], ...], List[int]] = {}
+        for index, messages in enumerate(conversations):
+            key = tuple((msg.role, msg.content) for msg in messages)
+            groups.setdefault(key, []).append(index)
+
+        indexes = list(groups.values())
+        results = await asyncio.gather(
+            *(
+                self._complete(
+                    conversations[group[0]], len(group), temperature, max_tokens, **kwargs
+                )
+                for group in indexes
+            ),
+            return_exceptions=return_exceptions
+        )
+
+        responses: List[Union[str, Exception]] = [""] * len(conversations)
+        for group, texts in zip(indexes, results):
+            if isinstance(texts, BaseException):
+                for index in group:
+                    responses[index] = texts
+                continue
+            for index, text in zip(group, texts):
+                responses[index] = text
+        return responses
+
+    async def _complete(
+        self,
+        messages: List[Message],
+        n: int,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> List[str]:
+        """Make one chat completion request for n choices.
+
+        Args:
+            messages: List of messages in the conversation
+            n: Number of choices to generate
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional OpenAI-specific options
+
+        Returns:
+            Text of each choice, in order
+
         Raises:
             ProviderError: If generation fails
             RateLimitError: If rate limit is exceeded
         """
         try:
-            # Convert messages to OpenAI format
+            # Convert messages to OpenAI format. Order is kept as given: the
+            # stable system prompt comes first, so OpenAI's automatic prefix
+            # caching applies to it
             openai_messages = [msg.to_dict() for msg in messages]
 
             # Build request parameters
@@ -67,17 +198,29 @@ class OpenAIProvider(LLMProvider):
                 **kwargs
             }
 
+            if n > 1:
+                request_params["n"] = n
+
             if max_tokens:
                 request_params["max_tokens"] = max_tokens
 
             # Make API call
-            response = self.client.chat.completions.create(**request_params)
+            response = await self.client.chat.completions.create(**request_params)
 
             # Extract text from response
-            return response.choices[0].message.content
+            choices = sorted(response.choices, key=lambda choice: choice.index)
+            return [choice.message.content for choice in choices]
 
         except openai.RateLimitError as e:
             raise RateLimitError(f"OpenAI rate limit exceeded: {e}")
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            raise AuthenticationError(f"OpenAI authentication failed: {e}")
+        except openai.APIConnectionError as e:
+            raise TransientError(f"OpenAI connection error: {e}")
+        except openai.APIStatusError as e:
+            if e.status_code >= 500:
+                raise TransientError(f"OpenAI server error: {e}")
+            raise ProviderError(f"OpenAI API error: {e}")
         except openai.APIError as e:
             raise ProviderError(f"OpenAI API error: {e}")
         except Exception as e:
@@ -122,14 +265,22 @@ class OpenAIProvider(LLMProvider):
                 request_params["max_tokens"] = max_tokens
 
             # Make streaming API call
-            stream = self.client.chat.completions.create(**request_params)
+            stream = await self.client.chat.completions.create(**request_params)
 
-            for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content is not None:
                     yield chunk.choices[0].delta.content
 
         except openai.RateLimitError as e:
             raise RateLimitError(f"OpenAI rate limit exceeded: {e}")
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            raise AuthenticationError(f"OpenAI authentication failed: {e}")
+        except openai.APIConnectionError as e:
+            raise TransientError(f"OpenAI connection error: {e}")
+        except openai.APIStatusError as e:
+            if e.status_code >= 500:
+                raise TransientError(f"OpenAI server error: {e}")
+            raise ProviderError(f"OpenAI API error: {e}")
         except openai.APIError as e:
             raise ProviderError(f"OpenAI API error: {e}")
         except Exception as e:
@@ -1,18 +1,34 @@
 """Feature model."""
 
+import os
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StringConstraints
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, NamedTuple, Optional
 
 from deepagents_runner.models import FeatureStatus
 
 
+# Three-digit feature ID (e.g. "001")
+FeatureId = Annotated[str, StringConstraints(pattern=r"^\d{3}$")]
+
+# Kebab-case feature name (e.g. "my-feature")
+FeatureName = Annotated[str, StringConstraints(pattern=r"^[a-z0-9-]+$")]
+
+
+class ArtifactPresence(NamedTuple):
+    """Paths of a feature's workflow artifacts that exist on disk (None if missing)."""
+
+    spec: Optional[Path]
+    plan: Optional[Path]
+    tasks: Optional[Path]
+
+
 class Feature(BaseModel):
     """Represents a software feature being developed."""
 
-    id: str = Field(pattern=r"^\d{3}$")
-    name: str = Field(pattern=r"^[a-z0-9-]+$")
+    id: FeatureId
+    name: FeatureName
     branch: str
     spec_dir: Path
     spec_file: Path
@@ -22,8 +38,28 @@ class Feature(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
-    class Config:
-        json_encoders = {
-            Path: str,
-            datetime: lambda v: v.isoformat()
-        }
+    def artifact_presence(self) -> ArtifactPresence:
+        """Check which artifacts exist with a single scan of the spec directory.
+
+        Returns:
+            ArtifactPresence with the path of each existing artifact
+        """
+        try:
+            with os.scandir(self.spec_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+
+        def present(path: Optional[Path]) -> Optional[Path]:
+            if path is None:
+                return None
+            if path.parent == self.spec_dir:
+                return path if path.name in names else None
+            # Artifact kept outside the spec directory
+            return path if path.exists() else None
+
+        return ArtifactPresence(
+            spec=present(self.spec_file),
+            plan=present(self.plan_file),
+            tasks=present(self.tasks_file)
+        )
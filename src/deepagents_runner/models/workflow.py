@@ -11,7 +11,7 @@ from deepagents_runner.models import WorkflowPhase, CommandType
 class CommandRecord(BaseModel):
     """Record of a completed command."""
     command: CommandType
-    timestamp: datetime
+    timestamp: int  # Unix epoch milliseconds (ISO 8601 in state files)
 
 
 class WorkflowState(BaseModel):
@@ -25,9 +25,3 @@ class WorkflowState(BaseModel):
     state_file: Path
     last_checkpoint: datetime = Field(default_factory=datetime.now)
     last_updated: datetime = Field(default_factory=datetime.now)
-
-    class Config:
-        json_encoders = {
-            Path: str,
-            datetime: lambda v: v.isoformat()
-        }
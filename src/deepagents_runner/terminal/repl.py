@@ -1,13 +1,13 @@
 """Interactive REPL session."""
 
+import re
 import sys
 import asyncio
-from typing import Optional
+from typing import Callable, Optional, Dict
 from pathlib import Path
 
 from deepagents_runner.terminal.ui import TerminalUI
 from deepagents_runner.core.context import ContextDetector
-from deepagents_runner.core.state import StateManager
 from deepagents_runner.core.commands import CommandExecutor
 from deepagents_runner.core.config import RunnerConfig
 from deepagents_runner.models import CommandType
@@ -15,6 +15,16 @@ from deepagents_runner.models.feature import Feature
 from deepagents_runner.models.workflow import WorkflowState
 
 
+# Seconds to wait for the provider connection to open before the first prompt
+_PREWARM_TIMEOUT = 2.0
+
+# Prefix of SpecKit commands (e.g. /speckit.plan)
+_SPECKIT_PREFIX = '/speckit.'
+
+# Matches --agent agent-name or --agents agent1,agent2
+_AGENT_PATTERN = re.compile(r'--agents?\s+([a-z0-9,-]+)')
+
+
 class REPLSession:
     """Interactive Read-Eval-Print Loop session."""
 
@@ -37,6 +47,22 @@ class REPLSession:
         self.state: Optional[WorkflowState] = None
         self.running = False
 
+        # Built-in commands, by lowercase name
+        self._builtins: Dict[str, Callable[[], None]] = {
+            "exit": self._cmd_exit,
+            "quit": self._cmd_exit,
+            "q": self._cmd_exit,
+            "help": self._cmd_help,
+            "?": self._cmd_help,
+            "context": self._cmd_context,
+            "refresh": self._cmd_refresh,
+        }
+
+        # One event loop for the whole session, so API connections pooled
+        # by the providers stay open between commands
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
     def start(self) -> None:
         """Start the REPL session."""
         self.ui.show_banner()
@@ -47,8 +73,7 @@ class REPLSession:
 
         # Load or create workflow state
         if self.feature:
-            state_manager = StateManager(self.feature.spec_dir)
-            self.state = state_manager.load_state(self.feature.id)
+            self.state = self._load_state(self.feature)
 
         # Show context
         self.ui.show_feature_context(self.feature)
@@ -68,53 +93,69 @@ class REPLSession:
         # Start main loop
         self.running = True
         try:
+            self._prewarm()
             while self.running:
                 self._handle_input()
         except KeyboardInterrupt:
             self.ui.console.print("\n")
             self.ui.print_info("Goodbye!")
             sys.exit(0)
+        finally:
+            self._close_loop()
+
+    def _prewarm(self) -> None:
+        """Open the connection to the LLM API while the user reads the help.
+
+        The first command then starts without a TCP/TLS handshake. Only an
+        optimization: it gives up after _PREWARM_TIMEOUT and ignores errors,
+        so offline use is not held up.
+        """
+        try:
+            self._loop.run_until_complete(asyncio.wait_for(
+                self.command_executor.llm_provider.prewarm(),
+                timeout=_PREWARM_TIMEOUT
+            ))
+        except asyncio.TimeoutError:
+            pass
+
+    def _close_loop(self) -> None:
+        """Cancel outstanding background tasks and close the event loop."""
+        if self._loop.is_closed():
+            return
+
+        pending = asyncio.all_tasks(self._loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        self._loop.close()
 
     def _handle_input(self) -> None:
         """Handle a single input from the user."""
         try:
-            user_input = self.ui.console.input("[bold cyan]>[/bold cyan] ").strip()
+            user_input = self.ui.read_line("[bold cyan]>[/bold cyan] ").strip()
 
             if not user_input:
                 return
 
-            # Handle built-in commands
-            if user_input.lower() in ('exit', 'quit', 'q'):
-                self.running = False
-                self.ui.print_info("Goodbye!")
-                return
-
-            if user_input.lower() in ('help', '?'):
-                self.ui.show_available_commands()
-                return
+            lowered = user_input.lower()
 
-            if user_input.lower() == 'context':
-                self.ui.show_feature_context(self.feature)
-                if self.state:
-                    self.ui.console.print()
-                    self.ui.show_workflow_state(self.state)
-                return
-
-            if user_input.lower() == 'refresh':
-                self.feature = self.context_detector.detect_feature()
-                if self.feature:
-                    state_manager = StateManager(self.feature.spec_dir)
-                    self.state = state_manager.load_state(self.feature.id)
-                self.ui.show_feature_context(self.feature)
+            # Handle built-in commands
+            handler = self._builtins.get(lowered)
+            if handler:
+                handler()
                 return
 
             # Handle agent commands
-            if user_input.lower().startswith('agents '):
+            if lowered.startswith('agents '):
                 self._handle_agent_command(user_input)
                 return
 
             # Handle SpecKit commands
-            if user_input.startswith('/speckit.'):
+            if user_input.startswith(_SPECKIT_PREFIX):
                 self._execute_command(user_input)
                 return
 
@@ -124,6 +165,40 @@ class REPLSession:
         except Exception as e:
             self.ui.print_error(f"Error: {e}")
 
+    def _load_state(self, feature: Feature) -> WorkflowState:
+        """Load a feature's workflow state through the executor's state manager.
+
+        Args:
+            feature: Feature to load the state of
+
+        Returns:
+            Workflow state (a new one if none was saved)
+        """
+        return self.command_executor.get_state_manager(feature.spec_dir).load_state(feature.id)
+
+    def _cmd_exit(self) -> None:
+        """End the session."""
+        self.running = False
+        self.ui.print_info("Goodbye!")
+
+    def _cmd_help(self) -> None:
+        """Show available commands."""
+        self.ui.show_available_commands()
+
+    def _cmd_context(self) -> None:
+        """Show the current feature and its workflow state."""
+        self.ui.show_feature_context(self.feature)
+        if self.state:
+            self.ui.console.print()
+            self.ui.show_workflow_state(self.state)
+
+    def _cmd_refresh(self) -> None:
+        """Detect the feature context again."""
+        self.feature = self.context_detector.detect_feature()
+        if self.feature:
+            self.state = self._load_state(self.feature)
+        self.ui.show_feature_context(self.feature)
+
     def _handle_agent_command(self, command_input: str) -> None:
         """Handle agent-related commands.
 
@@ -132,15 +207,17 @@ class REPLSession:
         """
         parts = command_input.split(maxsplit=2)
         if len(parts) < 2:
-            self.ui.print_error("Invalid agent command. Use: agents list|show|enable|disable")
+            self.ui.print_error("Invalid agent command. Use: agents list|show|enable|disable|cache")
             return
 
         subcommand = parts[1].lower()
 
         if subcommand == 'list':
             # Show all agents with their capabilities
-            agents = self.command_executor.agent_manager.list_agents(include_disabled=True)
-            self.ui.show_agent_list(agents)
+            agents = self.command_executor.agent_manager.list_agents(
+                include_disabled=True, by_priority=True
+            )
+            self.ui.show_agent_list(agents, pre_sorted=True)
 
         elif subcommand == 'show':
             if len(parts) < 3:
@@ -178,9 +255,17 @@ class REPLSession:
             else:
                 self.ui.print_error(f"Agent not found: {agent_name}")
 
+        elif subcommand == 'cache':
+            response_cache = self.command_executor.agent_manager.response_cache
+            if len(parts) > 2 and parts[2].lower() == 'clear':
+                response_cache.clear()
+                self.ui.print_success("Cleared cached responses")
+            else:
+                self.ui.show_cache_stats(response_cache.stats())
+
         else:
             self.ui.print_error(f"Unknown agent command: {subcommand}")
-            self.ui.print_info("Available: agents list|show|enable|disable")
+            self.ui.print_info("Available: agents list|show|enable|disable|cache")
 
     def _parse_agent_override(self, text: str) -> tuple[Optional[list], str]:
         """Parse --agent or --agents flag from command input.
@@ -191,11 +276,7 @@ class REPLSession:
         Returns:
             Tuple of (agent_list, remaining_text)
         """
-        import re
-
-        # Match --agent agent-name or --agents agent1,agent2
-        agent_pattern = r'--agents?\s+([a-z0-9,-]+)'
-        match = re.search(agent_pattern, text)
+        match = _AGENT_PATTERN.search(text)
 
         if not match:
             return None, text
@@ -214,7 +295,7 @@ class REPLSession:
                 self.ui.print_warning(f"Agent not found: {name}")
 
         # Remove the flag from text
-        remaining_text = re.sub(agent_pattern, '', text).strip()
+        remaining_text = _AGENT_PATTERN.sub('', text).strip()
 
         return agents if agents else None, remaining_text
 
@@ -226,7 +307,7 @@ class REPLSession:
         """
         # Parse command
         parts = command_input.split(maxsplit=1)
-        command_name = parts[0].replace('/speckit.', '')
+        command_name = parts[0][len(_SPECKIT_PREFIX):]
         remaining_input = parts[1] if len(parts) > 1 else None
 
         # Parse agent override
@@ -262,8 +343,7 @@ class REPLSession:
                 self.feature = self.context_detector.get_or_create_feature(
                     feature_id, feature_name
                 )
-                state_manager = StateManager(self.feature.spec_dir)
-                self.state = state_manager.load_state(self.feature.id)
+                self.state = self._load_state(self.feature)
             else:
                 self.ui.print_error(
                     "No feature context detected. "
@@ -292,18 +372,20 @@ class REPLSession:
             # Show progress indicator while model is running
             agent_name = selected_agents[0].name if selected_agents else "agent"
 
-            with self.ui.console.status(
-                f"[cyan]Running {command_type.value} with {agent_name}...[/cyan]",
-                spinner="dots"
-            ):
-                # Run async command in event loop
-                result = asyncio.run(
+            with self.ui.stream_output(
+                f"[cyan]Running {command_type.value} with {agent_name}...[/cyan]"
+            ) as view:
+                # Run async command in the session's event loop, showing the
+                # output as it is generated
+                result = self._loop.run_until_complete(
                     self.command_executor.execute_command(
                         command_type=command_type,
                         feature=self.feature,
                         agent_override=agent_override,
                         state=self.state,
-                        user_input=user_input
+                        user_input=user_input,
+                        on_chunk=view.append,
+                        on_restart=view.reset
                     )
                 )
 
@@ -361,17 +443,15 @@ class REPLSession:
                     self.ui.console.print("[bold cyan]💡 Suggested Next Steps:[/bold cyan]")
                     self.ui.print_markdown(result["suggestions"])
 
-                # Refresh state
-                if self.feature:
-                    state_manager = StateManager(self.feature.spec_dir)
-                    self.state = state_manager.load_state(self.feature.id)
+                # The command updated the state it was given
+                self.state = result.get("state", self.state)
 
-                    # Show suggested next command
-                    if self.state.suggested_next:
-                        self.ui.console.print()
-                        self.ui.print_info(
-                            f"Suggested next: /{self.state.suggested_next.value}"
-                        )
+                # Show suggested next command
+                if self.state and self.state.suggested_next:
+                    self.ui.console.print()
+                    self.ui.print_info(
+                        f"Suggested next: /{self.state.suggested_next.value}"
+                    )
             else:
                 self.ui.print_warning(f"Command completed with warnings")
                 if "message" in result:
@@ -1,31 +1,247 @@
 """Terminal UI using Rich library."""
 
-from typing import Optional
-from rich.console import Console
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
+from rich.live import Live
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn, BarColumn
 from rich.markdown import Markdown
+from rich.segment import Segment, Segments
+from rich.spinner import Spinner
 from rich.table import Table
+from rich.text import Text
+from rich.theme import Theme
 
 from deepagents_runner.models.feature import Feature
 from deepagents_runner.models.workflow import WorkflowState
 
+try:
+    # Gives input() line editing and history (not available on Windows)
+    import readline
+except ImportError:
+    readline = None
+
+
+# Terminal escape sequences, which readline must be told take no space
+_ESCAPE_SEQUENCE = re.compile(r"(\x1b\[[0-9;]*m)")
+
+
+# Styles of the message prefixes, parsed once for every console
+_THEME = Theme({
+    "info": "blue",
+    "success": "green",
+    "warning": "yellow",
+    "error": "red",
+})
+
+
+# Styled message prefixes, copied and extended for each message (the message
+# itself is plain text, not markup)
+_INFO_PREFIX = Text.assemble(("ℹ", "info"), " ")
+_SUCCESS_PREFIX = Text.assemble(("✓", "success"), " ")
+_WARNING_PREFIX = Text.assemble(("⚠", "warning"), " ")
+_ERROR_PREFIX = Text.assemble(("✗", "error"), " ")
+
+# Active agent status -> style (other statuses are unstyled)
+_STATUS_STYLES = {
+    "Running": "yellow",
+    "Completed": "green",
+    "Failed": "red",
+}
+
+_BANNER_TEXT = """# ACP prototype runner using DeepAgents
+
+An interactive runner for SpecKit commands powered by DeepAgents."""
+
+# Help table rows: (command, description)
+_SPECKIT_COMMANDS = (
+    ("/speckit.specify <desc>", "Create feature specification"),
+    ("/speckit.clarify", "Ask clarification questions"),
+    ("/speckit.plan", "Generate implementation plan"),
+    ("/speckit.tasks", "Generate task breakdown"),
+    ("/speckit.implement", "Execute implementation"),
+    ("/speckit.analyze", "Analyze cross-artifact consistency"),
+    ("/speckit.checklist", "Generate custom checklist"),
+    ("/speckit.constitution", "Create or update project constitution"),
+)
+
+_AGENT_COMMANDS = (
+    ("agents list", "Show all available agents"),
+    ("agents show <name>", "Show agent details"),
+    ("agents enable <name>", "Enable an agent"),
+    ("agents disable <name>", "Disable an agent"),
+    ("agents cache [clear]", "Show or clear cached responses"),
+)
+
+_BUILTIN_COMMANDS = (
+    ("help, ?", "Show this help message"),
+    ("context", "Display current context and state"),
+    ("refresh", "Reload feature context"),
+    ("exit, quit, q", "Exit the REPL"),
+)
+
+
+class StreamView:
+    """Live view of output as it is generated: its latest lines and a spinner."""
+
+    def __init__(self, status: str):
+        """Initialize stream view.
+
+        Args:
+            status: Text shown next to the spinner
+        """
+        self._chunks: List[str] = []
+        self._spinner = Spinner("dots", text=status)
+        # Bumped whenever the output changes
+        self._version = 0
+        # Chunks arrive on the event loop thread and are rendered on Live's
+        # refresh thread
+        self._lock = threading.Lock()
+        # Lines last rendered, and the (version, width, height) they are for
+        self._lines: List[List[Segment]] = []
+        self._lines_key: Optional[Tuple[int, int, int]] = None
+
+    def append(self, chunk: str) -> None:
+        """Add a piece of generated output."""
+        with self._lock:
+            self._chunks.append(chunk)
+            self._version += 1
+
+    def reset(self) -> None:
+        """Discard the output shown so far (generation is starting over)."""
+        with self._lock:
+            self._chunks.clear()
+            self._version += 1
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        # Show only as much of the end as fits above the spinner
+        height = max(1, console.size.height - 2)
+        with self._lock:
+            key = (self._version, options.max_width, height)
+            text = "".join(self._chunks) if key != self._lines_key else None
+        if text is not None:
+            self._lines = self._render_tail(text, console, options, height) if text else []
+            self._lines_key = key
+        for line in self._lines:
+            yield from line
+            yield Segment.line()
+        yield self._spinner
+
+    @staticmethod
+    def _render_tail(
+        text: str,
+        console: Console,
+        options: ConsoleOptions,
+        height: int
+    ) -> List[List[Segment]]:
+        """Render the last height lines of the output.
+
+        Only the end of the text is parsed as markdown (twice as many source
+        lines, and at most two screenfuls of characters), so the cost of a
+        refresh does not grow with the length of the output. The start of
+        the excerpt may render differently than in the full document (e.g.
+        inside a code block); the live view is replaced by the final output.
+        """
+        start = len(text)
+        for _ in range(2 * height):
+            start = text.rfind("\n", 0, start)
+            if start <= 0:
+                start = 0
+                break
+        start = max(start, len(text) - 2 * height * options.max_width)
+
+        lines = console.render_lines(Markdown(text[start:]), options, pad=False)
+        return lines[-height:]
+
 
 class TerminalUI:
     """Rich-based terminal user interface."""
 
+    # Help tables, built on first use (see _build_command_tables)
+    _command_tables: Optional[Group] = None
+    # Banner panel, with its markdown parsed on first use
+    _banner: Optional[Panel] = None
+
     def __init__(self):
         """Initialize terminal UI."""
-        self.console = Console()
+        # Output is styled explicitly, so Rich's automatic highlighting (a
+        # regex pass over every printed string) and :emoji: code
+        # replacement are turned off
+        self.console = Console(theme=_THEME, highlight=False, emoji=False)
+        # Output is not a terminal (CI logs, pipes): messages and tables are
+        # written as plain text, without going through Rich's renderer
+        self._fast = not self.console.is_terminal
+        # Output collected by batched(), or None when printing directly
+        self._buffer: Optional[List[RenderableType]] = None
+        # Help screen rendered for this console: (width, segments)
+        self._help_segments: Optional[Tuple[int, List[Segment]]] = None
+        # Prompt markup -> rendered prompt string
+        self._prompts: Dict[str, str] = {}
+        # Progress display shared by all tasks, created on first use
+        self._progress: Optional[Progress] = None
+
+    @contextmanager
+    def batched(self) -> Iterator[None]:
+        """Collect messages printed in the block and write them in one pass.
+
+        Covers print_info/success/warning/error and other output routed
+        through _emit; direct console.print calls are not delayed.
+        """
+        if self._buffer is not None:
+            # Already batching; the outer block flushes
+            yield
+            return
 
-    def show_banner(self) -> None:
-        """Display startup banner."""
-        banner = """
-# ACP prototype runner using DeepAgents
+        self._buffer = []
+        try:
+            yield
+        finally:
+            buffer, self._buffer = self._buffer, None
+            if buffer and self._fast:
+                # Plain lines from _emit_line
+                self.console.file.write("".join(f"{line}\n" for line in buffer))
+            elif buffer:
+                self.console.print(Group(*buffer))
+
+    def _emit(self, renderable: RenderableType) -> None:
+        """Print a renderable, or add it to the current batch."""
+        if self._buffer is not None:
+            self._buffer.append(renderable)
+        else:
+            self.console.print(renderable)
+
+    def _emit_line(self, line: str) -> None:
+        """Write a plain line of text, or add it to the current batch (fast path)."""
+        if self._buffer is not None:
+            self._buffer.append(line)
+        else:
+            self.console.file.write(f"{line}\n")
+
+    def _print_rows(
+        self,
+        title: str,
+        headers: Tuple[str, ...],
+        rows: List[Tuple[str, ...]]
+    ) -> None:
+        """Write a table as tab-separated lines (fast path).
 
-An interactive runner for SpecKit commands powered by DeepAgents.
+        Args:
+            title: Table title, written on its own line first
+            headers: Column headers
+            rows: Cell values for each row, without markup
         """
-        self.console.print(Panel(Markdown(banner.strip()), border_style="blue"))
+        lines = [title, "\t".join(headers)]
+        lines.extend("\t".join(row) for row in rows)
+        self.console.file.write("".join(f"{line}\n" for line in lines))
+
+    def show_banner(self) -> None:
+        """Display startup banner."""
+        if TerminalUI._banner is None:
+            TerminalUI._banner = Panel(Markdown(_BANNER_TEXT), border_style="blue")
+        self.console.print(TerminalUI._banner)
 
     def show_feature_context(self, feature: Optional[Feature]) -> None:
         """Display current feature context.
@@ -68,64 +284,39 @@ An interactive runner for SpecKit commands powered by DeepAgents.
 
         self.console.print(Panel(table, title="Workflow State", border_style="blue"))
 
-    def show_available_commands(self) -> None:
-        """Display list of available SpecKit commands."""
-        # SpecKit Commands
-        speckit_commands = [
-            ("/speckit.specify <desc>", "Create feature specification"),
-            ("/speckit.clarify", "Ask clarification questions"),
-            ("/speckit.plan", "Generate implementation plan"),
-            ("/speckit.tasks", "Generate task breakdown"),
-            ("/speckit.implement", "Execute implementation"),
-            ("/speckit.analyze", "Analyze cross-artifact consistency"),
-            ("/speckit.checklist", "Generate custom checklist"),
-            ("/speckit.constitution", "Create or update project constitution"),
-        ]
-
-        table = Table(show_header=True, title="SpecKit Commands")
-        table.add_column("Command", style="cyan")
-        table.add_column("Description")
-
-        for cmd, desc in speckit_commands:
-            table.add_row(cmd, desc)
-
-        self.console.print(table)
-        self.console.print()
+    @classmethod
+    def _build_command_tables(cls) -> Group:
+        """Build the help tables once; they are the same for every session."""
+        if cls._command_tables is None:
+            tables = []
+            for title, style, commands in (
+                ("SpecKit Commands", "cyan", _SPECKIT_COMMANDS),
+                ("Agent Commands", "green", _AGENT_COMMANDS),
+                ("Built-in Commands", "yellow", _BUILTIN_COMMANDS),
+            ):
+                table = Table(show_header=True, title=title)
+                table.add_column("Command", style=style)
+                table.add_column("Description")
 
-        # Agent Commands
-        agent_commands = [
-            ("agents list", "Show all available agents"),
-            ("agents show <name>", "Show agent details"),
-            ("agents enable <name>", "Enable an agent"),
-            ("agents disable <name>", "Disable an agent"),
-        ]
+                for cmd, desc in commands:
+                    table.add_row(cmd, desc)
 
-        agent_table = Table(show_header=True, title="Agent Commands")
-        agent_table.add_column("Command", style="green")
-        agent_table.add_column("Description")
+                tables.append(table)
 
-        for cmd, desc in agent_commands:
-            agent_table.add_row(cmd, desc)
+            cls._command_tables = Group(tables[0], "", tables[1], "", tables[2])
+        return cls._command_tables
 
-        self.console.print(agent_table)
-        self.console.print()
-
-        # Built-in Commands
-        builtin_commands = [
-            ("help, ?", "Show this help message"),
-            ("context", "Display current context and state"),
-            ("refresh", "Reload feature context"),
-            ("exit, quit, q", "Exit the REPL"),
-        ]
-
-        builtin_table = Table(show_header=True, title="Built-in Commands")
-        builtin_table.add_column("Command", style="yellow")
-        builtin_table.add_column("Description")
-
-        for cmd, desc in builtin_commands:
-            builtin_table.add_row(cmd, desc)
+    def show_available_commands(self) -> None:
+        """Display list of available SpecKit commands.
 
-        self.console.print(builtin_table)
+        The tables are rendered once per terminal width and the resulting
+        segments are reused.
+        """
+        width = self.console.width
+        if self._help_segments is None or self._help_segments[0] != width:
+            segments = list(self.console.render(self._build_command_tables()))
+            self._help_segments = (width, segments)
+        self.console.print(Segments(self._help_segments[1]))
 
     def print_info(self, message: str) -> None:
         """Print info message.
@@ -133,7 +324,7 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         Args:
             message: Message to display
         """
-        self.console.print(f"[blue]ℹ[/blue] {message}")
+        self._print_message(_INFO_PREFIX, message)
 
     def print_success(self, message: str) -> None:
         """Print success message.
@@ -141,7 +332,7 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         Args:
             message: Message to display
         """
-        self.console.print(f"[green]✓[/green] {message}")
+        self._print_message(_SUCCESS_PREFIX, message)
 
     def print_warning(self, message: str) -> None:
         """Print warning message.
@@ -149,7 +340,7 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         Args:
             message: Message to display
         """
-        self.console.print(f"[yellow]⚠[/yellow] {message}")
+        self._print_message(_WARNING_PREFIX, message)
 
     def print_error(self, message: str) -> None:
         """Print error message.
@@ -157,7 +348,17 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         Args:
             message: Message to display
         """
-        self.console.print(f"[red]✗[/red] {message}")
+        self._print_message(_ERROR_PREFIX, message)
+
+    def _print_message(self, prefix: Text, message: str) -> None:
+        """Print a message after its styled prefix."""
+        if self._fast:
+            self._emit_line(f"{prefix.plain}{message}")
+            return
+
+        text = prefix.copy()
+        text.append(message)
+        self._emit(text)
 
     def print_markdown(self, content: str) -> None:
         """Print formatted markdown content.
@@ -167,21 +368,81 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         """
         self.console.print(Markdown(content))
 
-    def create_progress(self, description: str) -> Progress:
-        """Create a progress indicator.
+    @contextmanager
+    def stream_output(self, status: str) -> Iterator[StreamView]:
+        """Show generated output live while a command runs.
+
+        The view is removed when the block exits, so the caller can print
+        the final result in its place.
+
+        Args:
+            status: Text shown next to the spinner
+
+        Yields:
+            StreamView to feed output chunks into
+        """
+        view = StreamView(status)
+        with Live(view, console=self.console, refresh_per_second=8, transient=True):
+            yield view
+
+    def create_progress(self, description: str) -> TaskID:
+        """Add a task to the progress display.
+
+        All tasks share one Progress, which is started when the first task
+        is added and stopped when the last one is completed.
 
         Args:
             description: Progress description
 
         Returns:
-            Progress object
+            Task ID to pass to complete_task (or to update on self._progress)
         """
-        return Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=self.console
-        )
+        if self._progress is None:
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                console=self.console
+            )
+        if not self._progress.task_ids:
+            self._progress.start()
+        return self._progress.add_task(description)
+
+    def complete_task(self, task_id: TaskID) -> None:
+        """Mark a progress task as finished and remove it from the display.
+
+        Args:
+            task_id: Task ID returned by create_progress
+        """
+        if self._progress is None:
+            return
+
+        self._progress.remove_task(task_id)
+        if not self._progress.task_ids:
+            self._progress.stop()
+
+    def read_line(self, prompt: str) -> str:
+        """Read a line of input after a styled prompt.
+
+        Each prompt's markup is rendered once; input() then prints it, so
+        readline (when available) knows the prompt and can redraw the line
+        while editing.
+
+        Args:
+            prompt: Prompt text with Rich markup
+
+        Returns:
+            Line entered by the user
+        """
+        rendered = self._prompts.get(prompt)
+        if rendered is None:
+            with self.console.capture() as capture:
+                self.console.print(prompt, end="", soft_wrap=True)
+            rendered = capture.get()
+            if readline is not None:
+                rendered = _ESCAPE_SEQUENCE.sub("\001\\1\002", rendered)
+            self._prompts[prompt] = rendered
+        return input(rendered)
 
     def prompt(self, message: str, default: str = "") -> str:
         """Prompt user for input.
@@ -198,7 +459,7 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         else:
             prompt_text = f"[cyan]{message}[/cyan]: "
 
-        return self.console.input(prompt_text) or default
+        return self.read_line(prompt_text) or default
 
     def confirm(self, message: str, default: bool = False) -> bool:
         """Ask for yes/no confirmation.
@@ -210,8 +471,9 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         Returns:
             True if confirmed, False otherwise
         """
-        suffix = " [Y/n]" if default else " [y/N]"
-        response = self.console.input(f"[cyan]{message}{suffix}[/cyan]: ").lower().strip()
+        # Escaped so Rich does not read the brackets as a markup tag
+        suffix = " \\[Y/n]" if default else " \\[y/N]"
+        response = self.read_line(f"[cyan]{message}{suffix}[/cyan]: ").lower().strip()
 
         if not response:
             return default
@@ -232,10 +494,14 @@ An interactive runner for SpecKit commands powered by DeepAgents.
             agent = agents[0]
             self.print_info(f"Selected: {agent.name} ({agent.specialization or 'general'})")
         else:
-            self.print_info(f"Selected {len(agents)} agents:")
-            for agent in agents:
-                role_desc = agent.specialization or "general"
-                self.console.print(f"  • {agent.name} ([cyan]{role_desc}[/cyan])")
+            with self.batched():
+                self.print_info(f"Selected {len(agents)} agents:")
+                for agent in agents:
+                    role_desc = agent.specialization or "general"
+                    if self._fast:
+                        self._emit_line(f"  • {agent.name} ({role_desc})")
+                    else:
+                        self._emit(f"  • {agent.name} ([cyan]{role_desc}[/cyan])")
 
     def show_active_agents_table(self, active_agents: dict) -> Table:
         """Create and display active agents table.
@@ -252,30 +518,31 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         table.add_column("Status")
         table.add_column("Task")
 
+        rows = []
         for agent_name, info in active_agents.items():
             status = info.get('status', 'Unknown')
             task = info.get('task', '')
+            rows.append((agent_name, status, task))
 
-            # Color code status
-            if status == 'Running':
-                status_str = f"[yellow]{status}[/yellow]"
-            elif status == 'Completed':
-                status_str = f"[green]{status}[/green]"
-            elif status == 'Failed':
-                status_str = f"[red]{status}[/red]"
-            else:
-                status_str = status
-
-            table.add_row(agent_name, status_str, task)
+            # Color code status (styling the text only, not the cell padding)
+            status_text = Text.assemble((status, _STATUS_STYLES.get(status, "")))
+            table.add_row(agent_name, status_text, task)
 
-        self.console.print(table)
+        if self._fast:
+            self._print_rows("Active Agents", ("Agent", "Status", "Task"), rows)
+        else:
+            self.console.print(table)
         return table
 
-    def show_agent_list(self, agents: list) -> None:
+    def show_agent_list(self, agents: list, pre_sorted: bool = False) -> None:
         """Display list of all agents with their capabilities.
 
+        Agents are shown by priority, highest first.
+
         Args:
             agents: List of AgentDefinition objects
+            pre_sorted: agents is already in that order (e.g. from
+                AgentManager.list_agents(by_priority=True)), so it is not sorted again
         """
         table = Table(title="Available Agents", show_header=True)
         table.add_column("Status", width=6)
@@ -285,7 +552,26 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         table.add_column("Priority", justify="right")
 
         # Sort by priority (descending)
-        sorted_agents = sorted(agents, key=lambda a: a.priority, reverse=True)
+        sorted_agents = agents if pre_sorted else sorted(
+            agents, key=lambda a: a.priority, reverse=True
+        )
+
+        if self._fast:
+            self._print_rows(
+                "Available Agents",
+                ("Status", "Name", "Specialization", "Capabilities", "Priority"),
+                [
+                    (
+                        "✓" if agent.enabled else "✗",
+                        agent.name,
+                        agent.specialization or "general",
+                        ", ".join(agent.capabilities) or "none",
+                        str(agent.priority)
+                    )
+                    for agent in sorted_agents
+                ]
+            )
+            return
 
         for agent in sorted_agents:
             status = "✓" if agent.enabled else "✗"
@@ -322,9 +608,31 @@ An interactive runner for SpecKit commands powered by DeepAgents.
         table.add_row("Capabilities:", caps)
         table.add_row("File:", str(agent.file_path.name))
 
-        self.console.print(Panel(table, title=f"Agent: {agent.name}", border_style="blue"))
+        # Details followed by the full prompt content, in one pass
+        self.console.print(Group(
+            Panel(table, title=f"Agent: {agent.name}", border_style="blue"),
+            "",
+            "[bold]Agent Prompt:[/bold]",
+            Panel(agent.content, border_style="dim")
+        ))
+
+    def show_cache_stats(self, stats: Dict[str, Any]) -> None:
+        """Display response cache statistics.
+
+        Args:
+            stats: Statistics from ResponseCache.stats()
+        """
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "[dim]n/a[/dim]"
+
+        table = Table(show_header=False, box=None, padding=(0, 2))
+        table.add_row(
+            "Status:", "[green]Enabled[/green]" if stats["enabled"] else "[red]Disabled[/red]"
+        )
+        table.add_row("Hits:", str(stats["hits"]))
+        table.add_row("Misses:", str(stats["misses"]))
+        table.add_row("Hit rate:", hit_rate)
+        table.add_row("In memory:", str(stats["entries"]))
+        table.add_row("Directory:", stats["directory"] or "[dim]none[/dim]")
 
-        # Show full prompt content
-        self.console.print()
-        self.console.print("[bold]Agent Prompt:[/bold]")
-        self.console.print(Panel(agent.content, border_style="dim"))
+        self.console.print(Panel(table, title="Response Cache", border_style="blue"))
@@ -2,75 +2,106 @@
 
 
 class RunnerError(Exception):
-    """Base exception for all runner errors."""
-    pass
+    """Base exception for all runner errors.
+
+    Errors carry only their message, so no class adds instance attributes
+    (BaseException already provides __dict__ for anything set ad hoc).
+    """
+
+    __slots__ = ()
 
 
 class AgentError(RunnerError):
     """Agent-related errors."""
-    pass
+
+    __slots__ = ()
 
 
 class AgentDefinitionError(AgentError):
     """Agent definition file is malformed."""
-    pass
+
+    __slots__ = ()
 
 
 class AgentExecutionError(AgentError):
     """Agent execution failed."""
-    pass
+
+    __slots__ = ()
 
 
 class CommandError(RunnerError):
     """Command execution errors."""
-    pass
+
+    __slots__ = ()
 
 
 class CommandExecutionError(CommandError):
     """Command failed during execution."""
-    pass
+
+    __slots__ = ()
 
 
 class ContextError(RunnerError):
     """Context detection errors."""
-    pass
+
+    __slots__ = ()
 
 
 class ContextDetectionError(ContextError):
     """Failed to detect feature context."""
-    pass
+
+    __slots__ = ()
 
 
 class StateError(RunnerError):
     """State management errors."""
-    pass
+
+    __slots__ = ()
 
 
 class StateLoadError(StateError):
     """Failed to load state file."""
-    pass
+
+    __slots__ = ()
 
 
 class StateSaveError(StateError):
     """Failed to save state file."""
-    pass
+
+    __slots__ = ()
 
 
 class ProviderError(RunnerError):
     """LLM provider errors."""
-    pass
+
+    __slots__ = ()
 
 
 class ProviderConfigError(ProviderError):
     """Provider configuration is invalid."""
-    pass
+
+    __slots__ = ()
 
 
 class ProviderNotAvailableError(ProviderError):
     """Provider API key not set or provider unavailable."""
-    pass
+
+    __slots__ = ()
 
 
 class RateLimitError(ProviderError):
     """Provider rate limit exceeded."""
-    pass
+
+    __slots__ = ()
+
+
+class AuthenticationError(ProviderError):
+    """Provider rejected the API credentials."""
+
+    __slots__ = ()
+
+
+class TransientError(ProviderError):
+    """Temporary provider failure (network error, timeout, server error)."""
+
+    __slots__ = ()
@@ -1,36 +1,105 @@
 """File operations utility."""
 
-import json
+import os
+import sys
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
+
 from deepagents_runner.utils.exceptions import StateLoadError, StateSaveError
 
 
+# ReplaceFileW flags: write through to disk, ignore ACL/attribute merge errors
+_REPLACEFILE_FLAGS = 0x1 | 0x2
+
+
+def user_cache_dir() -> Path:
+    """Get the per-user cache directory for DeepAgents Runner.
+
+    Honors XDG_CACHE_HOME and falls back to ~/.cache.
+
+    Returns:
+        Path to the cache directory (not created)
+    """
+    cache_root = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_root) / "deepagents-runner"
+
+
 def read_json(file_path: Path) -> Dict[str, Any]:
     """Read JSON file with schema versioning support."""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            return data
+        return orjson.loads(file_path.read_bytes())
     except FileNotFoundError:
         raise StateLoadError(f"State file not found: {file_path}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise StateLoadError(f"Invalid JSON in {file_path}: {e}")
 
 
 def write_json(file_path: Path, data: Dict[str, Any]) -> None:
-    """Write JSON file atomically."""
+    """Write JSON file atomically.
+
+    The data is written to a temporary file and synced to disk before it
+    replaces file_path, so a crash leaves either the old or the new
+    version. datetime values are written as ISO 8601 strings.
+    """
     try:
         # Ensure directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
+        payload = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+
         # Write atomically by writing to temp file then renaming
-        temp_path = file_path.with_suffix('.tmp')
-        with open(temp_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        temp_path = file_path.with_name(file_path.name + '.tmp')
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
         # Atomic rename
-        temp_path.replace(file_path)
+        _replace(temp_path, file_path)
+        _sync_directory(file_path.parent)
     except Exception as e:
         raise StateSaveError(f"Failed to write {file_path}: {e}")
+
+
+def _replace(source: Path, target: Path) -> None:
+    """Atomically replace target with source.
+
+    On Windows an existing target is replaced with ReplaceFileW, which keeps
+    the swap atomic while other processes (virus scanners, the search
+    indexer) hold the target open.
+    """
+    if sys.platform != "win32" or not target.exists():
+        os.replace(source, target)
+        return
+
+    import ctypes
+
+    replace_file = ctypes.windll.kernel32.ReplaceFileW
+    if not replace_file(str(target), str(source), None, _REPLACEFILE_FLAGS, None, None):
+        raise ctypes.WinError()
+
+
+def _write_all(fd: int, payload: bytes) -> None:
+    """Write all of payload to a file descriptor (one write call in practice)."""
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _sync_directory(directory: Path) -> None:
+    """Make a rename in directory durable (POSIX only; a no-op elsewhere)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -1,12 +1,143 @@
 """Git operations utility."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+import importlib.util
+import os
 import subprocess
 
+_HEAD_REF_PREFIX = "ref: refs/heads/"
+
+# HEAD file path -> (mtime_ns, branch name) from the last read
+_head_cache: Dict[Path, Tuple[int, str]] = {}
+
+# With the optional pygit2 package, refs are read in-process instead of
+# running git (pip install deepagents-runner[git])
+_PYGIT2_AVAILABLE = importlib.util.find_spec("pygit2") is not None
+
+# Git directory -> open pygit2 repository
+_repositories: Dict[Path, Any] = {}
+
+# Git directory -> (refs signature, branch names) from the last listing
+_branches_cache: Dict[Path, Tuple[Tuple[int, ...], List[str]]] = {}
+
+
+def find_git_dir(start: Optional[Path] = None) -> Optional[Path]:
+    """Find the git directory for a working tree without running git.
+
+    Searches start (default: cwd) and its parents for .git, following the
+    "gitdir:" pointer used by worktrees and submodules.
+
+    Args:
+        start: Directory to search from
+
+    Returns:
+        Path to the git directory, or None if not inside a repository
+    """
+    start = (start or Path.cwd()).resolve()
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                pointer = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if pointer.startswith("gitdir:"):
+                return (directory / pointer[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def _read_head_branch(git_dir: Path) -> Optional[str]:
+    """Read the branch name from HEAD, reusing the last result until HEAD changes.
+
+    Returns:
+        Branch name, "HEAD" when detached (as git rev-parse reports it), or
+        None if HEAD cannot be read or points outside refs/heads
+    """
+    head_path = git_dir / "HEAD"
+    try:
+        mtime_ns = head_path.stat().st_mtime_ns
+        cached = _head_cache.get(head_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        head = head_path.read_text().strip()
+    except OSError:
+        return None
+
+    if head.startswith(_HEAD_REF_PREFIX):
+        branch = head[len(_HEAD_REF_PREFIX):]
+    elif head.startswith("ref:"):
+        return None
+    else:
+        branch = "HEAD"
+
+    _head_cache[head_path] = (mtime_ns, branch)
+    return branch
+
+
+def _refs_signature(git_dir: Path) -> Optional[Tuple[int, ...]]:
+    """Modification times that change whenever a local branch is created or deleted.
+
+    Covers every directory under refs/heads (a new or deleted ref file
+    changes its parent directory's mtime) and packed-refs.
+
+    Returns:
+        Signature tuple, or None if the refs cannot be inspected
+    """
+    # Linked worktrees keep their refs in the main repository's git directory
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    try:
+        if commondir_file.is_file():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+
+        signature = []
+        for directory, _, _ in os.walk(common_dir / "refs" / "heads"):
+            signature.append(os.stat(directory).st_mtime_ns)
+        if not signature:
+            return None
+        try:
+            signature.append(os.stat(common_dir / "packed-refs").st_mtime_ns)
+        except FileNotFoundError:
+            signature.append(0)
+    except OSError:
+        return None
+    return tuple(signature)
+
+
+def _open_repository(git_dir: Path) -> Any:
+    """Open a repository with pygit2, reusing it on later calls.
+
+    Raises:
+        pygit2.GitError: If the repository cannot be opened
+    """
+    repository = _repositories.get(git_dir)
+    if repository is None:
+        import pygit2
+
+        repository = pygit2.Repository(str(git_dir))
+        _repositories[git_dir] = repository
+    return repository
+
 
 def get_current_branch() -> Optional[str]:
-    """Get the current git branch name."""
+    """Get the current git branch name.
+
+    Reads .git/HEAD directly when possible; git itself is only run for
+    layouts this cannot handle.
+    """
+    git_dir = find_git_dir()
+    if git_dir is not None:
+        branch = _read_head_branch(git_dir)
+        if branch is not None:
+            return branch
+    elif "GIT_DIR" not in os.environ:
+        # Not inside a repository; no need to ask git
+        return None
+
     try:
         result = subprocess.run(
             ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
@@ -21,6 +152,11 @@ def get_current_branch() -> Optional[str]:
 
 def is_git_repo() -> bool:
     """Check if current directory is a git repository."""
+    if find_git_dir() is not None:
+        return True
+    if "GIT_DIR" not in os.environ:
+        return False
+
     try:
         subprocess.run(
             ['git', 'rev-parse', '--git-dir'],
@@ -33,21 +169,43 @@ def is_git_repo() -> bool:
 
 
 def list_branches() -> list[str]:
-    """List all git branches."""
+    """List all git branches.
+
+    The result is reused until a branch is created or deleted (see
+    _refs_signature).
+    """
+    git_dir = find_git_dir()
+    signature = _refs_signature(git_dir) if git_dir is not None else None
+    if signature is not None:
+        cached = _branches_cache.get(git_dir)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+
+    branches = _list_branches(git_dir)
+    if signature is not None:
+        _branches_cache[git_dir] = (signature, branches)
+    return list(branches)
+
+
+def _list_branches(git_dir: Optional[Path]) -> List[str]:
+    """List local branches without caching."""
+    if git_dir is not None and _PYGIT2_AVAILABLE:
+        import pygit2
+
+        try:
+            # Sorted by name, as git branch lists them
+            return sorted(_open_repository(git_dir).branches.local)
+        except pygit2.GitError:
+            pass
+
     try:
+        # One undecorated branch name per line, sorted by name
         result = subprocess.run(
-            ['git', 'branch', '--list'],
+            ['git', 'for-each-ref', '--format=%(refname:short)', 'refs/heads/'],
             capture_output=True,
             text=True,
             check=True
         )
-        branches = []
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if line:
-                # Remove the * marker from current branch
-                branch = line.lstrip('* ')
-                branches.append(branch)
-        return branches
+        return result.stdout.splitlines()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return []